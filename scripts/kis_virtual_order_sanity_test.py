@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import argparse
 import time
-from typing import Any, Callable, Optional
+from typing import Any, Optional
 
 from khms_trader.config import load_settings
 from khms_trader.broker.korea_invest_api import KoreaInvestBroker
@@ -7,6 +7,7 @@ from pathlib import Path
 
 from khms_trader.execution.runner import NextOpenConfig, prepare_next_open_plan
 from khms_trader.notifications.telegram import TelegramNotifier
+from khms_trader.utils.logging_utils import setup_logging
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
@@ -28,6 +29,7 @@ def main() -> None:
     args = ap.parse_args()
 
     _ensure_pythonpath()
+    setup_logging()  # logs/khms_trader.log
 
     tg = TelegramNotifier()
     try:
@@ -57,6 +59,8 @@ def main() -> None:
         except Exception:
             pass
         raise
+    finally:
+        tg.close()
 
 
 if __name__ == "__main__":
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import json
+import mmap
 import os
 from pathlib import Path
 from datetime import datetime
@@ -45,6 +46,37 @@ def _tail_text(path: Path, max_lines: int = 200) -> str:
         return ""
 
 
+def _tail_events(path: Path, n: int = 100) -> List[Dict[str, Any]]:
+    """
+    live_events.jsonl 의 마지막 n개 이벤트 (오래된 것 -> 최신 순).
+    파일을 mmap 한 뒤 끝에서부터 줄바꿈만 역탐색하므로, 로그가 커져도 읽는 양은 n줄 분량.
+    깨진 줄(쓰는 중인 마지막 줄 등)은 건너뛴다.
+    """
+    if n <= 0 or not path.exists():
+        return []
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                out: List[Dict[str, Any]] = []
+                end = len(mm)
+                while end > 0 and len(out) < n:
+                    start = mm.rfind(b"\n", 0, end - 1) + 1
+                    line = mm[start:end].strip()
+                    end = start
+                    if not line:
+                        continue
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        continue
+        out.reverse()
+        return out
+    except Exception:
+        return []
+
+
 def _list_log_files() -> List[Path]:
     if not LOGS_DIR.exists():
         return []
@@ -208,6 +240,17 @@ def main() -> None:
 
     st.divider()
 
+    # ---- Events ----
+    st.subheader("Live Events (tail)")
+    n_events = st.slider("Recent events", min_value=20, max_value=1000, value=100, step=20)
+    events = _tail_events(EVENTS_PATH, n=int(n_events))
+    if not events:
+        st.info("No events found under /reports/live_events.jsonl.")
+    else:
+        st.dataframe(pd.DataFrame(events[::-1]), use_container_width=True, hide_index=True)
+
+    st.divider()
+
     # ---- Logs ----
     st.subheader("Logs (tail)")
     log_files = _list_log_files()
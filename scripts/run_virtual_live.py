@@ -5,7 +5,7 @@ import argparse
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, Dict
+from typing import Any, Optional
 
 import pandas as pd
 
@@ -8,6 +8,7 @@ from datetime import datetime
 
 from khms_trader.execution.scheduler import TimeOfDayScheduler, TimeOfDaySchedule
 from khms_trader.execution.runner import NextOpenConfig, prepare_next_open_plan, execute_next_open_plan
+from khms_trader.utils.logging_utils import setup_logging
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
@@ -42,6 +43,7 @@ def main() -> None:
     args = ap.parse_args()
 
     _ensure_pythonpath()
+    setup_logging()  # logs/khms_trader.log
 
     cfg = NextOpenConfig(
         universe_limit=args.universe_limit,
@@ -6,6 +6,7 @@ from pathlib import Path
 
 from khms_trader.execution.scheduler import IntervalScheduler, IntervalSchedule
 from khms_trader.execution.runner import run_virtual_tick, LiveRunConfig
+from khms_trader.utils.logging_utils import setup_logging
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
@@ -17,6 +18,7 @@ def main() -> None:
     ap.add_argument("--price", type=float, default=None)
     ap.add_argument("--dry-run", action="store_true")
     args = ap.parse_args()
+    setup_logging()  # logs/khms_trader.log
 
     cfg = LiveRunConfig(
         universe_limit=args.universe_limit,
@@ -7,8 +7,6 @@
 import sys
 from pathlib import Path
 
-import pandas as pd
-
 # 1) 프로젝트 / src 경로 세팅
 CURRENT_DIR = Path(__file__).resolve().parent
 PROJECT_ROOT = CURRENT_DIR.parent
@@ -21,9 +21,10 @@ UNIVERSE_DIR = DATA_DIR / "universe"
 
 def load_raw(symbol: str) -> pd.DataFrame:
     """
-    종목 코드(예: '005930')에 해당하는 raw CSV를 로딩하는 함수.
+    종목 코드(예: '005930')에 해당하는 raw 데이터를 로딩하는 함수.
 
-    기대 파일 경로:
+    기대 파일 경로 (parquet 우선):
+      data/raw/{symbol}.parquet
       data/raw/{symbol}.csv
 
     컬럼 예시:
@@ -33,12 +34,16 @@ def load_raw(symbol: str) -> pd.DataFrame:
       - date 컬럼을 datetime으로 파싱한 DataFrame
       - date 기준 오름차순 정렬
     """
+    parquet_path = RAW_DIR / f"{symbol}.parquet"
     path = RAW_DIR / f"{symbol}.csv"
-    if not path.exists():
+    if parquet_path.exists():
+        path = parquet_path
+        df = pd.read_parquet(path, engine="pyarrow")
+    elif path.exists():
+        df = pd.read_csv(path)
+    else:
         raise FileNotFoundError(f"[load_raw] 파일이 없습니다: {path}")
 
-    df = pd.read_csv(path)
-
     # date 컬럼 datetime 변환
     if "date" not in df.columns:
         raise KeyError(f"[load_raw] 'date' 컬럼이 없습니다: {path}")
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional, List, Type, Any, Dict
+from typing import Optional, List, Type, Any
 
 import pandas as pd
 
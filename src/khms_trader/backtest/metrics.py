@@ -2,19 +2,23 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING, List
+
 import numpy as np
-import pandas as pd
-from typing import List
-from khms_trader.backtest.hsms_single import Trade
+
+if TYPE_CHECKING:
+    # 타입 힌트 전용: pandas / 백테스터 모듈은 런타임에 로드하지 않음
+    import pandas as pd
+
+    from khms_trader.backtest.hsms_single import Trade
 
 
 def compute_total_return(equity_df: pd.DataFrame) -> float:
     """
     총 수익률 (단위: 0.25 → 25%)
     """
-    start = float(equity_df["equity"].iloc[0])
-    end = float(equity_df["equity"].iloc[-1])
-    return (end - start) / start
+    arr = equity_df["equity"].to_numpy()
+    return float((arr[-1] - arr[0]) / arr[0])
 
 
 def compute_max_drawdown(equity_df: pd.DataFrame) -> float:
@@ -46,9 +50,13 @@ def compute_sharpe_ratio(equity_df: pd.DataFrame, periods_per_year: int = 252) -
     """
     if equity_df is None or len(equity_df) < 3:
         return None
-    eq = equity_df['equity'].astype(float)
-    rets = eq.pct_change().dropna()
-    if rets.std() == 0 or len(rets) < 2:
+    eq = equity_df["equity"].to_numpy(dtype=np.float64)
+    rets = eq[1:] / eq[:-1] - 1.0
+    rets = rets[~np.isnan(rets)]
+    if len(rets) < 2:
+        return None
+    std = rets.std(ddof=1)
+    if std == 0:
         return None
-    sharpe = (rets.mean() / rets.std()) * (periods_per_year ** 0.5)
+    sharpe = (rets.mean() / std) * (periods_per_year ** 0.5)
     return float(sharpe)
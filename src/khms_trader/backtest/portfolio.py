@@ -11,6 +11,10 @@ class Portfolio:
         """
 
         for symbol, sig in signals.items():
+            # 관망(0) 신호는 가격 조회 없이 바로 스킵
+            if sig != 1 and sig != -1:
+                continue
+
             price = price_map.get(symbol)
             if price is None:
                 continue
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -52,10 +52,23 @@ class BaseBroker(ABC):
         """보유 종목 수량 딕셔너리: {symbol: qty}"""
         raise NotImplementedError
 
+    def warm_up(self) -> None:
+        """
+        첫 조회/주문 전에 미리 해 둘 준비(접근 토큰 발급 등). 기본은 아무것도 하지 않음.
+        실패하면 예외를 그대로 올린다. (호출부에서 로그만 남기고 진행 가능)
+        """
+
     def get_position(self, symbol: str) -> int:
         """특정 종목 보유 수량"""
         return int(self.get_positions().get(symbol, 0))
 
+    def get_cash_and_positions(self) -> Tuple[float, Dict[str, int]]:
+        """
+        현금 + 보유 종목 스냅샷을 한 번에.
+        한 번의 잔고 조회로 둘 다 얻을 수 있는 브로커는 오버라이드해서 호출 수를 줄인다.
+        """
+        return float(self.get_cash()), self.get_positions()
+
     @abstractmethod
     def place_order(self, req: OrderRequest) -> OrderResult:
         """주문 실행"""
@@ -5,7 +5,6 @@ from __future__ import annotations
 
 from khms_trader.config import load_settings
 from khms_trader.broker.paper_broker import PaperBroker
-from khms_trader.broker.korea_invest_api import KoreaInvestBroker
 
 
 def make_broker():
@@ -21,6 +20,9 @@ def make_broker():
 
     # 2) KOREA INVEST
     if provider == "korea_invest":
+        # requests 의존성은 실제 KIS 브로커가 필요할 때만 로드 (paper 실행 시 기동 비용 절감)
+        from khms_trader.broker.korea_invest_api import KoreaInvestBroker
+
         kis = (s.get("korea_invest") or {}).get(env)
         if not kis:
             raise KeyError(f"korea_invest.{env} not found in secrets.yaml")
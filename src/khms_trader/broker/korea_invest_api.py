@@ -1,13 +1,15 @@
 # src/khms_trader/broker/korea_invest_api.py
 from __future__ import annotations
 
-from dataclasses import asdict
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 
+import threading
 import time
 import requests
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 from .base import BaseBroker, OrderRequest, OrderResult
+from khms_trader.utils.json_utils import json_dumps_bytes, json_loads
 
 
 class KoreaInvestBroker(BaseBroker):
@@ -36,9 +38,14 @@ class KoreaInvestBroker(BaseBroker):
         self.virtual = virtual
         self.timeout_sec = timeout_sec
 
+        # 모든 REST 호출이 같은 keep-alive 커넥션 풀을 재사용
         self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
         self._access_token: Optional[str] = None
         self._token_expire_at: float = 0.0
+        # 여러 스레드(폴링 등)가 동시에 tokenP를 호출하지 않도록 보호
+        self._tok_lock = threading.RLock()
+        self._refresh_timer: Optional[threading.Timer] = None
 
         # 계좌번호 파싱: "CANO-ACNT_PRDT_CD" 또는 "CANO"만 들어오는 케이스 대응
         if "-" in account_no:
@@ -51,18 +58,22 @@ class KoreaInvestBroker(BaseBroker):
 
     def _post(self, path: str, headers: Dict[str, str], json: Optional[dict] = None, params: Optional[dict] = None) -> dict:
         url = self.base_url + path
-        r = requests.post(url, headers=headers, json=json, params=params, timeout=10)
+        body = json_dumps_bytes(json) if json is not None else None
+        if body is not None:
+            headers = {**headers}
+            headers.setdefault("content-type", "application/json")
+        r = self._session.post(url, headers=headers, data=body, params=params, timeout=self.timeout_sec)
         if not r.ok:
             raise RuntimeError(
                 f"HTTP {r.status_code} for {url}\n"
                 f"response_text={r.text}\n"
             )
         
-        return r.json()
+        return json_loads(r.content)
 
     def _get(self, path: str, headers: Dict[str, str], params: Optional[dict] = None) -> dict:
         url = self.base_url + path
-        r = requests.get(url, headers=headers, params=params, timeout=10)
+        r = self._session.get(url, headers=headers, params=params, timeout=self.timeout_sec)
 
         if not r.ok:
             raise RuntimeError(
@@ -70,14 +81,23 @@ class KoreaInvestBroker(BaseBroker):
                 f"response_test={r.text}\n"
             )
         
-        return r.json()
+        return json_loads(r.content)
+
+    def _token_valid(self) -> bool:
+        return bool(self._access_token) and time.time() < self._token_expire_at
 
     def _ensure_token(self) -> None:
-        # 토큰이 유효하면 재사용
-        now = time.time()
-        if self._access_token and now < self._token_expire_at:
+        # 토큰이 유효하면 재사용 (락 없이 빠르게 확인)
+        if self._token_valid():
             return
 
+        with self._tok_lock:
+            # 다른 스레드가 락 대기 중에 이미 갱신했을 수 있으므로 재확인
+            if self._token_valid():
+                return
+            self._issue_token()
+
+    def _issue_token(self) -> None:
         # OAuth2 tokenP 발급 (grant_type=client_credentials)
         # KIS 오픈API에서 통상 사용하는 토큰 발급 방식
         # (응답의 expires_in을 이용해 만료시각 설정)
@@ -97,6 +117,30 @@ class KoreaInvestBroker(BaseBroker):
         self._access_token = token
         self._token_expire_at = time.time() + max(expires_in - 60, 60)
 
+        self._schedule_token_refresh(expires_in)
+
+    def _schedule_token_refresh(self, expires_in: int) -> None:
+        """
+        TTL의 90%가 지나면 백그라운드에서 미리 토큰을 갱신한다.
+        (주문/조회 호출이 토큰 발급 때문에 멈추지 않도록)
+        """
+        if expires_in <= 0:
+            return
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        timer = threading.Timer(expires_in * 0.9, self._refresh_token)
+        timer.daemon = True
+        timer.start()
+        self._refresh_timer = timer
+
+    def _refresh_token(self) -> None:
+        with self._tok_lock:
+            try:
+                self._issue_token()
+            except Exception as e:
+                # 실패해도 다음 API 호출 시 _ensure_token에서 동기 재발급
+                print(f"[WARN] token prefetch failed: {e}")
+
     def _auth_headers(self, tr_id: str) -> Dict[str, str]:
         self._ensure_token()
         assert self._access_token is not None
@@ -130,11 +174,8 @@ class KoreaInvestBroker(BaseBroker):
 
     # ---------- BaseBroker interface ----------
 
-    def get_cash(self) -> float:
-        """
-        예수금/현금성 잔고: 잔고조회(inquire-balance) 응답의 output2 계열에서 추출.
-        필드명은 계정/환경에 따라 다를 수 있어 몇 가지 후보를 순차 탐색.
-        """
+    def _inquire_balance(self) -> Dict[str, Any]:
+        """잔고조회(inquire-balance) 원본 응답. 현금/보유종목/총평가 모두 이 한 번의 호출에서 나온다."""
         tr_id = "VTTC8434R" if self.virtual else "TTTC8434R"  # 잔고조회 TR (모의/실전) :contentReference[oaicite:5]{index=5}
         headers = self._auth_headers(tr_id=tr_id)
 
@@ -152,20 +193,24 @@ class KoreaInvestBroker(BaseBroker):
             "CTX_AREA_NK100": "",
         }
 
-        data = self._get("/uapi/domestic-stock/v1/trading/inquire-balance", headers=headers, params=params)
+        return self._get("/uapi/domestic-stock/v1/trading/inquire-balance", headers=headers, params=params)
+
+    @staticmethod
+    def _balance_output2(data: Dict[str, Any]) -> Dict[str, Any]:
         out2 = data.get("output2")
-        print("[DEBUG][inquire-balance] output2 type:", type(out2))
 
         if isinstance(out2, list):
             if not out2:
                 raise RuntimeError("inquire-balance output2 is empty list")
             out2 = out2[0]
-        
-        print("[DEBUG][inquire-balance] output2 keys:", list(out2.keys()))
-
 
         if not isinstance(out2, dict):
             raise RuntimeError(f"Unexpected output2 type: {type(out2)}")
+        return out2
+
+    @classmethod
+    def _cash_from_balance(cls, data: Dict[str, Any]) -> float:
+        out2 = cls._balance_output2(data)
 
         # 후보 필드들(환경별 상이): dnca_tot_amt / prvs_rcdl_excc_amt 
         for key in ["dnca_tot_amt", "prvs_rcdl_excc_amt", "cma_evlu_amt"]:
@@ -177,38 +222,40 @@ class KoreaInvestBroker(BaseBroker):
                     pass
 
         raise RuntimeError(f"Cannot parse cash from inquire-balance. resp_keys={list(out2.keys())}")
+
+    @staticmethod
+    def _positions_from_balance(data: Dict[str, Any]) -> Dict[str, int]:
+        rows = data.get("output1") or []
+        pos: Dict[str, int] = {}
+        for r in rows:
+            sym = str(r.get("pdno", "")).strip()
+            qty = r.get("hldg_qty") or r.get("ord_psbl_qty") or r.get("qty")
+            if not sym:
+                continue
+            try:
+                q = int(float(qty))
+            except Exception:
+                q = 0
+            if q != 0:
+                pos[sym] = q
+        return pos
+
+    def warm_up(self) -> None:
+        """접근 토큰을 미리 발급 (첫 잔고조회/주문에서 tokenP 대기 제거)"""
+        self._ensure_token()
+
+    def get_cash(self) -> float:
+        """
+        예수금/현금성 잔고: 잔고조회(inquire-balance) 응답의 output2 계열에서 추출.
+        필드명은 계정/환경에 따라 다를 수 있어 몇 가지 후보를 순차 탐색.
+        """
+        return self._cash_from_balance(self._inquire_balance())
     
     def get_total_value(self) -> float:
         """
         총자산/평가금액: inquire-balance output2의 tot_evlu_amt를 사용.
         """
-        tr_id = "VTTC8434R" if self.virtual else "TTTC8434R"
-        headers = self._auth_headers(tr_id=tr_id)
-
-        params = {
-            "CANO": self._cano,
-            "ACNT_PRDT_CD": self._acnt_prdt_cd,
-            "AFHR_FLPR_YN": "N",
-            "OFL_YN": "",
-            "INQR_DVSN": "02",
-            "UNPR_DVSN": "01",
-            "FUND_STTL_ICLD_YN": "N",
-            "FNCG_AMT_AUTO_RDPT_YN": "N",
-            "PRCS_DVSN": "00",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": "",
-        }
-
-        data = self._get("/uapi/domestic-stock/v1/trading/inquire-balance", headers=headers, params=params)
-        out2 = data.get("output2")
-
-        if isinstance(out2, list):
-            if not out2:
-                raise RuntimeError("inquire-balance output2 is empty list")
-            out2 = out2[0]
-
-        if not isinstance(out2, dict):
-            raise RuntimeError(f"Unexpected output2 type: {type(out2)}")
+        out2 = self._balance_output2(self._inquire_balance())
 
         v = out2.get("tot_evlu_amt")
         if v is None or str(v).strip() == "":
@@ -221,38 +268,12 @@ class KoreaInvestBroker(BaseBroker):
         """
         보유 종목 수량: inquire-balance의 output1(보유종목 리스트)에서 qty 추출.
         """
-        tr_id = "VTTC8434R" if self.virtual else "TTTC8434R"
-        headers = self._auth_headers(tr_id=tr_id)
+        return self._positions_from_balance(self._inquire_balance())
 
-        params = {
-            "CANO": self._cano,
-            "ACNT_PRDT_CD": self._acnt_prdt_cd,
-            "AFHR_FLPR_YN": "N",
-            "OFL_YN": "",
-            "INQR_DVSN": "02",
-            "UNPR_DVSN": "01",
-            "FUND_STTL_ICLD_YN": "N",
-            "FNCG_AMT_AUTO_RDPT_YN": "N",
-            "PRCS_DVSN": "00",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": "",
-        }
-
-        data = self._get("/uapi/domestic-stock/v1/trading/inquire-balance", headers=headers, params=params)
-        rows = data.get("output1") or []
-        pos: Dict[str, int] = {}
-        for r in rows:
-            sym = str(r.get("pdno", "")).strip()
-            qty = r.get("hldg_qty") or r.get("ord_psbl_qty") or r.get("qty")
-            if not sym:
-                continue
-            try:
-                q = int(float(qty))
-            except Exception:
-                q = 0
-            if q != 0:
-                pos[sym] = q
-        return pos
+    def get_cash_and_positions(self) -> Tuple[float, Dict[str, int]]:
+        """현금 + 보유 종목을 잔고조회 1회로 (get_cash/get_positions 각각 호출 시 2회)"""
+        data = self._inquire_balance()
+        return self._cash_from_balance(data), self._positions_from_balance(data)
 
     def get_position(self, symbol: str) -> int:
         return int(self.get_positions().get(symbol, 0))
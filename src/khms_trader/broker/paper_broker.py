@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Dict
 
 from .base import BaseBroker, OrderRequest, OrderResult
 
+# side 문자열 -> 정수 코드 (0=BUY, 1=SELL), 주문당 문자열 비교 대신 dict 조회 1회
+_SIDE_CODES: Dict[str, int] = {"BUY": 0, "SELL": 1}
+
 
 @dataclass
 class PaperBroker(BaseBroker):
@@ -16,19 +20,34 @@ class PaperBroker(BaseBroker):
     """
 
     cash: float = 100_000_000.0  # 초기 모의투자 자본 (예: 1억)
-    positions: Dict[str, int] = field(default_factory=dict)
+    positions: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
     _order_seq: int = 0
 
+    def __post_init__(self) -> None:
+        # 외부에서 일반 dict를 넘겨도 BUY 경로가 키 존재 여부 분기 없이 동작하도록
+        if not isinstance(self.positions, defaultdict):
+            self.positions = defaultdict(int, self.positions)
+
     def _next_order_id(self) -> str:
         self._order_seq += 1
         return f"PB-{self._order_seq:08d}"
 
     # --- BaseBroker 인터페이스 구현 ---
 
+    def warm_up(self) -> None:
+        # 메모리 상 모의 브로커라 준비할 것 없음
+        return None
+
     def get_cash(self) -> float:
         return float(self.cash)
 
+    def _gc_positions(self) -> None:
+        """SELL로 0이 된 키 정리 (주문 경로에서는 삭제하지 않고 조회 시점에 한 번에 정리)"""
+        if 0 in self.positions.values():
+            self.positions = defaultdict(int, {k: v for k, v in self.positions.items() if v != 0})
+
     def get_positions(self) -> Dict[str, int]:
+        self._gc_positions()
         return dict(self.positions)
 
     def get_position(self, symbol: str) -> int:
@@ -57,34 +76,33 @@ class PaperBroker(BaseBroker):
         qty = int(req.quantity)
         cost = price * qty
 
-        if side == "BUY":
-            if self.cash < cost:
-                return OrderResult(
-                    success=False,
-                    message=f"insufficient cash: required={cost:.2f}, cash={self.cash:.2f}",
-                )
-            self.cash -= cost
-            self.positions[req.symbol] = int(self.positions.get(req.symbol, 0)) + qty
+        side_code = _SIDE_CODES.get(side)
+        if side_code is None:
+            return OrderResult(
+                success=False,
+                message=f"invalid side: {req.side} (expected BUY/SELL)",
+            )
 
-        elif side == "SELL":
-            pos = int(self.positions.get(req.symbol, 0))
+        if side_code:  # SELL
+            # defaultdict에 0 키가 생기지 않도록 조회는 get으로 한 번만
+            pos = self.positions.get(req.symbol, 0)
             if pos < qty:
                 return OrderResult(
                     success=False,
                     message=f"insufficient position: have={pos}, try_sell={qty}",
                 )
             self.cash += cost
-            new_pos = pos - qty
-            if new_pos == 0:
-                self.positions.pop(req.symbol, None)
-            else:
-                self.positions[req.symbol] = new_pos
+            # 전량 매도여도 0으로 남겨두고 get_positions()에서 정리
+            self.positions[req.symbol] = pos - qty
 
-        else:
-            return OrderResult(
-                success=False,
-                message=f"invalid side: {req.side} (expected BUY/SELL)",
-            )
+        else:  # BUY
+            if self.cash < cost:
+                return OrderResult(
+                    success=False,
+                    message=f"insufficient cash: required={cost:.2f}, cash={self.cash:.2f}",
+                )
+            self.cash -= cost
+            self.positions[req.symbol] += qty
 
         order_id = self._next_order_id()
         return OrderResult(
@@ -1,9 +1,11 @@
 # src/khms_trader/config.py
-
+"""setting.yaml / secrets.yaml 로더: (경로, mtime) 기준으로 캐시하고 읽기 전용 Mapping으로 반환."""
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
 import yaml
 
@@ -11,32 +13,51 @@ import yaml
 # (src/khms_trader/config.py 기준으로 ../../config)
 CONFIG_DIR = Path(__file__).resolve().parents[2] / "config"
 
+# libyaml(C) 로더가 있으면 사용 (순수 파이썬 로더 대비 훨씬 빠름)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _freeze(obj: Any) -> Any:
+    """중첩 dict를 읽기 전용 MappingProxyType으로 변환 (캐시 공유 상태 보호)"""
+    if isinstance(obj, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in obj.items()})
+    return obj
+
+
+@lru_cache(maxsize=None)
+def _load_yaml_cached(path_str: str, mtime_ns: int) -> Mapping[str, Any]:
+    with open(path_str, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YAML_LOADER) or {}
+    if not isinstance(data, dict):
+        raise ValueError(f"YAML root must be a dict: {path_str}")
+    return _freeze(data)
+
 
-def _load_yaml(path: Path) -> Dict[str, Any]:
+def _load_yaml(path: Path) -> Mapping[str, Any]:
+    """
+    YAML 로드 (프로세스 내 캐시).
+    파일 수정시각(mtime)이 바뀌면 자동으로 다시 파싱한다.
+    """
     if not path.exists():
         raise FileNotFoundError(f"YAML not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        data = yaml.safe_load(f) or {}
-    if not isinstance(data, dict):
-        raise ValueError(f"YAML root must be a dict: {path}")
-    return data
+    return _load_yaml_cached(str(path), path.stat().st_mtime_ns)
 
 
-def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+def _deep_merge(base: Mapping[str, Any], override: Mapping[str, Any]) -> Dict[str, Any]:
     """
     중첩 dict까지 안전하게 병합.
     override가 base를 덮어씀.
     """
-    out: Dict[str, Any] = dict(base) if isinstance(base, dict) else {}
+    out: Dict[str, Any] = dict(base) if isinstance(base, Mapping) else {}
     for k, v in (override or {}).items():
-        if k in out and isinstance(out[k], dict) and isinstance(v, dict):
+        if k in out and isinstance(out[k], Mapping) and isinstance(v, Mapping):
             out[k] = _deep_merge(out[k], v)
         else:
             out[k] = v
     return out
 
 
-def load_secrets() -> Dict[str, Any]:
+def load_secrets() -> Mapping[str, Any]:
     """
     민감 정보 (secrets.yaml) 로드.
 
@@ -52,7 +73,7 @@ def load_secrets() -> Dict[str, Any]:
     return _load_yaml(path)
 
 
-def load_settings() -> Dict[str, Any]:
+def load_settings() -> Mapping[str, Any]:
     """
     일반 설정 (setting.yaml) + 민감 정보 (secrets.yaml) 병합 로드.
 
@@ -67,4 +88,4 @@ def load_settings() -> Dict[str, Any]:
 
     # secrets가 setting을 덮어쓰도록 병합
     merged = _deep_merge(settings, secrets)
-    return merged
+    return _freeze(merged)
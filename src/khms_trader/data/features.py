@@ -1,54 +1,254 @@
 import pandas as pd
 import numpy as np
 
+from khms_trader.utils.jit import njit
+
+
+# 커널들은 NaN 검사에 의존하므로 fastmath(nnan 가정)는 사용하지 않는다.
+@njit(cache=True)
+def _ema_kernel(x: np.ndarray, span: int) -> np.ndarray:
+    """EMA(adjust=False) 재귀식: y[t] = y[t-1] + alpha * (x[t] - y[t-1])"""
+    n = x.shape[0]
+    out = np.empty_like(x)
+    alpha = 2.0 / (span + 1.0)
+    prev = np.nan
+    for i in range(n):
+        v = x[i]
+        if np.isnan(v):
+            out[i] = prev
+            continue
+        if np.isnan(prev):
+            prev = v
+        else:
+            prev = prev + alpha * (v - prev)
+        out[i] = prev
+    return out
+
+
+@njit(cache=True)
+def _rsi_kernel(close: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder RSI 단일 패스 커널.
+
+    - 첫 period개 변화량의 단순평균으로 시작
+    - 이후 avg = (avg * (period - 1) + 현재값) / period 로 재귀 평활
+    - 앞쪽 period개 값은 NaN
+    """
+    n = close.shape[0]
+    out = np.empty_like(close)
+    out[:] = np.nan
+    if n <= period:
+        return out
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = close[i] - close[i - 1]
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        rs = avg_gain / (avg_loss + 1e-9)
+        out[i] = 100.0 - (100.0 / (1.0 + rs))
+    return out
+
+
+@njit(cache=True)
+def _wilder_mean_kernel(x: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder 평활 이동평균.
+
+    - 첫 period개 값의 단순평균으로 시작 (index = period - 1)
+    - 이후 avg = (avg * (period - 1) + x[t]) / period
+    """
+    n = x.shape[0]
+    out = np.empty_like(x)
+    out[:] = np.nan
+    if n < period:
+        return out
+
+    avg = 0.0
+    for i in range(period):
+        avg += x[i] / period
+    out[period - 1] = avg
+    for i in range(period, n):
+        avg = (avg * (period - 1) + x[i]) / period
+        out[i] = avg
+    return out
+
+
+@njit(cache=True)
+def _hsms_kernel(
+    close, high, low, volume, foreign_net_buy,
+    rsi_period, atr_period, vol_window, foreign_window,
+    out_ema20, out_ema50, out_rsi, out_atr, out_vol_ma,
+    out_trend_ok, out_rsi_cross, out_vol_ok,
+    out_foreign_buy_rolling, out_foreign_trend_ok,
+):
+    """
+    HSMS 지표/플래그를 한 번의 루프로 계산하는 융합 커널.
+
+    calc_ema / calc_rsi / calc_atr / rolling(min_periods=window) 와 같은 정의:
+    - EMA(adjust=False), NaN 입력은 직전 값 유지
+    - RSI / ATR: Wilder 평활, 앞쪽 구간 NaN
+    - 거래량 이동평균 / 외국인 순매수 일수: 링버퍼 누적합, window 미만 구간 NaN
+    """
+    n = close.shape[0]
+    a20 = 2.0 / 21.0
+    a50 = 2.0 / 51.0
+    ema20 = np.nan
+    ema50 = np.nan
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    rsi_prev = np.nan
+
+    tr_sum = 0.0
+    atr = np.nan
+
+    vol_buf = np.zeros(vol_window)
+    vol_sum = 0.0
+    vol_nan = 0  # 윈도우 안 NaN 개수 (하나라도 있으면 평균은 NaN)
+
+    fb_buf = np.zeros(foreign_window, dtype=np.int64)
+    fb_cnt = 0
+
+    for i in range(n):
+        c = close[i]
+
+        # --- EMA20 / EMA50
+        if not np.isnan(c):
+            if np.isnan(ema20):
+                ema20 = c
+                ema50 = c
+            else:
+                ema20 = ema20 + a20 * (c - ema20)
+                ema50 = ema50 + a50 * (c - ema50)
+        out_ema20[i] = ema20
+        out_ema50[i] = ema50
+
+        # --- RSI (Wilder)
+        rsi = np.nan
+        if i >= 1 and n > rsi_period:
+            delta = c - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if i <= rsi_period:
+                avg_gain += gain / rsi_period
+                avg_loss += loss / rsi_period
+            else:
+                avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+                avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+            if i >= rsi_period:
+                rs = avg_gain / (avg_loss + 1e-9)
+                rsi = 100.0 - (100.0 / (1.0 + rs))
+        out_rsi[i] = rsi
+
+        # --- ATR (TR: 첫 행은 H-L)
+        tr = high[i] - low[i]
+        if i >= 1:
+            pc = close[i - 1]
+            d1 = abs(high[i] - pc)
+            d2 = abs(low[i] - pc)
+            if d2 > d1 or np.isnan(d1):
+                d1 = d2
+            if d1 > tr or np.isnan(tr):
+                tr = d1
+        if i < atr_period:
+            tr_sum += tr / atr_period
+            if i == atr_period - 1:
+                atr = tr_sum
+        else:
+            atr = (atr * (atr_period - 1) + tr) / atr_period
+        out_atr[i] = atr
+
+        # --- 거래량 이동평균 / 필터
+        v = volume[i]
+        j = i % vol_window
+        if i >= vol_window:
+            old = vol_buf[j]
+            if np.isnan(old):
+                vol_nan -= 1
+            else:
+                vol_sum -= old
+        vol_buf[j] = v
+        if np.isnan(v):
+            vol_nan += 1
+        else:
+            vol_sum += v
+        vol_ma = np.nan
+        if i >= vol_window - 1 and vol_nan == 0:
+            vol_ma = vol_sum / vol_window
+        out_vol_ma[i] = vol_ma
+        out_vol_ok[i] = v >= vol_ma * 1.3
+
+        # --- 추세 / RSI 50 재돌파
+        out_trend_ok[i] = (ema20 > ema50) and (c > ema20)
+        out_rsi_cross[i] = (rsi_prev < 50) and (rsi >= 50)
+        rsi_prev = rsi
+
+        # --- 외국인 순매수 일수 (최근 foreign_window일)
+        k = i % foreign_window
+        if i >= foreign_window:
+            fb_cnt -= fb_buf[k]
+        pos = 1 if foreign_net_buy[i] > 0 else 0
+        fb_buf[k] = pos
+        fb_cnt += pos
+        if i >= foreign_window - 1:
+            out_foreign_buy_rolling[i] = fb_cnt
+            out_foreign_trend_ok[i] = fb_cnt >= 2
+        else:
+            out_foreign_buy_rolling[i] = np.nan
+            out_foreign_trend_ok[i] = False
+
 
 def calc_ema(series: pd.Series, span: int) -> pd.Series:
     """Exponentially Weighted Moving Average."""
-    return series.ewm(span=span, adjust=False).mean()
+    values = series.to_numpy(dtype=np.float64, copy=False)
+    return pd.Series(_ema_kernel(values, span), index=series.index)
 
 
 def calc_rsi(close: pd.Series, period: int = 14) -> pd.Series:
     """
-    Relative Strength Index (RSI) 계산.
+    Relative Strength Index (RSI) 계산. (Wilder 평활)
 
     close: 종가 시계열
     period: RSI 기간
     """
-    delta = close.diff()
-
-    gain = np.where(delta > 0, delta, 0.0)
-    loss = np.where(delta < 0, -delta, 0.0)
-
-    gain = pd.Series(gain, index=close.index)
-    loss = pd.Series(loss, index=close.index)
-
-    avg_gain = gain.rolling(window=period, min_periods=period).mean()
-    avg_loss = loss.rolling(window=period, min_periods=period).mean()
-
-    rs = avg_gain / (avg_loss + 1e-9)
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    values = close.to_numpy(dtype=np.float64, copy=False)
+    return pd.Series(_rsi_kernel(values, period), index=close.index)
 
 
 def calc_atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
     """
-    Average True Range (ATR) 계산.
+    Average True Range (ATR) 계산. (Wilder 평활)
 
     df에는 최소한 'high', 'low', 'close' 컬럼이 있어야 한다.
     """
-    high = df["high"]
-    low = df["low"]
-    close = df["close"]
+    h = df["high"].to_numpy(dtype=np.float64)
+    l = df["low"].to_numpy(dtype=np.float64)
+    c = df["close"].to_numpy(dtype=np.float64)
 
-    prev_close = close.shift(1)
+    prev_close = np.empty_like(c)
+    if len(c):
+        prev_close[0] = np.nan
+        prev_close[1:] = c[:-1]
 
-    tr1 = high - low
-    tr2 = (high - prev_close).abs()
-    tr3 = (low - prev_close).abs()
+    # TR = max(H-L, |H-C_prev|, |L-C_prev|)  (fmax: 첫 행의 NaN은 무시)
+    tr = np.abs(h - prev_close)
+    np.fmax(tr, np.abs(l - prev_close), out=tr)
+    np.fmax(h - l, tr, out=tr)
 
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    atr = tr.rolling(window=period, min_periods=period).mean()
-    return atr
+    atr = _wilder_mean_kernel(tr, period)
+    return pd.Series(atr, index=df.index)
 
 
 def add_hsms_features(
@@ -70,32 +270,35 @@ def add_hsms_features(
     if missing:
         raise KeyError(f"add_hsms_features: required columns missing: {missing}")
 
-    out = df.copy()
-
-    # 기본 지표
-    out["ema20"] = calc_ema(out["close"], span=20)
-    out["ema50"] = calc_ema(out["close"], span=50)
-    out["rsi"] = calc_rsi(out["close"], period=rsi_period)
-    out["atr"] = calc_atr(out, period=atr_period)
-    out["vol_ma20"] = out["volume"].rolling(
-        window=vol_window, min_periods=vol_window
-    ).mean()
-
-    # 추세 조건
-    out["trend_ok"] = (out["ema20"] > out["ema50"]) & (out["close"] > out["ema20"])
+    def _col(name: str) -> np.ndarray:
+        return np.ascontiguousarray(df[name].to_numpy(dtype=np.float64))
 
-    # RSI 50 재돌파
-    out["rsi_prev"] = out["rsi"].shift(1)
-    out["rsi_cross_50"] = (out["rsi_prev"] < 50) & (out["rsi"] >= 50)
+    n = len(df)
+    ema20, ema50, rsi, atr, vol_ma20, foreign_buy_rolling = (np.empty(n) for _ in range(6))
+    trend_ok, rsi_cross_50, vol_ok, foreign_trend_ok = (
+        np.empty(n, dtype=np.bool_) for _ in range(4)
+    )
 
-    # 거래량 필터
-    out["vol_ok"] = out["volume"] >= out["vol_ma20"] * 1.3
+    # 지표/플래그를 단일 패스로 계산 (외국인 순매수: 최근 foreign_window일 중 2일 이상)
+    # RSI 50 재돌파는 커널 안에서 직전 RSI 스칼라로 판정하므로 rsi_prev 컬럼은 만들지 않는다.
+    _hsms_kernel(
+        _col("close"), _col("high"), _col("low"), _col("volume"), _col("foreign_net_buy"),
+        rsi_period, atr_period, vol_window, foreign_window,
+        ema20, ema50, rsi, atr, vol_ma20,
+        trend_ok, rsi_cross_50, vol_ok,
+        foreign_buy_rolling, foreign_trend_ok,
+    )
 
-    # 외국인 순매수 롤링 조건 (최근 foreign_window일 중 2일 이상 순매수)
-    positive_foreign = out["foreign_net_buy"] > 0
-    out["foreign_buy_rolling"] = positive_foreign.rolling(
-        window=foreign_window, min_periods=foreign_window
-    ).sum()
-    out["foreign_trend_ok"] = out["foreign_buy_rolling"] >= 2
-
-    return out
+    # 원본 복사 없이 새 컬럼을 한 번에 붙인다.
+    return df.assign(
+        ema20=ema20,
+        ema50=ema50,
+        rsi=rsi,
+        atr=atr,
+        vol_ma20=vol_ma20,
+        trend_ok=trend_ok,
+        rsi_cross_50=rsi_cross_50,
+        vol_ok=vol_ok,
+        foreign_buy_rolling=foreign_buy_rolling,
+        foreign_trend_ok=foreign_trend_ok,
+    )
@@ -1,14 +1,32 @@
 from __future__ import annotations
 
-import json
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Mapping
 
 import pandas as pd
 import requests
-import yaml
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from khms_trader.utils.json_utils import json_dumps_bytes, json_loads
+
+try:
+    import fcntl  # POSIX 전용 (프로세스 간 토큰 캐시 잠금)
+except ImportError:  # pragma: no cover  (Windows)
+    fcntl = None  # type: ignore
+
+try:
+    import pyarrow  # noqa: F401  (parquet 저장용, 선택 의존성)
+    _HAS_PYARROW = True
+except ImportError:  # pragma: no cover
+    _HAS_PYARROW = False
 
 
 # --------------------------------------------------
@@ -24,6 +42,14 @@ CONFIG_DIR = PROJECT_ROOT / "config"
 DATA_DIR = PROJECT_ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
 
+# (connect, read) 타임아웃 초
+REQUEST_TIMEOUT = (3.05, 10)
+
+# access_token 디스크 캐시 (KIS 토큰 유효기간 ~24h, 실행마다 재발급하지 않도록)
+TOKEN_CACHE_PATH = Path.home() / ".cache" / "khms_trader" / "kis_token.json"
+TOKEN_EXPIRY_MARGIN_SEC = 300
+TOKEN_DEFAULT_TTL_SEC = 86400
+
 
 # --------------------------------------------------
 # 설정 / 시크릿 로딩
@@ -47,11 +73,11 @@ def load_kis_secrets() -> KISSecrets:
 
     secrets = load_secrets()
     ki = secrets.get("korea_invest")
-    if not isinstance(ki, dict):
+    if not isinstance(ki, Mapping):
         raise KeyError("secrets.yaml에 'korea_invest' 섹션이 없습니다. (korea_invest.virtual/real)")
 
     v = ki.get("virtual")
-    if not isinstance(v, dict):
+    if not isinstance(v, Mapping):
         raise KeyError("secrets.yaml에 'korea_invest.virtual' 섹션이 없습니다.")
 
     return KISSecrets(
@@ -63,6 +89,104 @@ def load_kis_secrets() -> KISSecrets:
     )
 
 
+# --------------------------------------------------
+# access_token 디스크 캐시
+# --------------------------------------------------
+def _token_cache_key(base_url: str, app_key: str) -> str:
+    """도메인 + app_key 별로 토큰을 구분 (app_key 원문은 저장하지 않음)"""
+    return hashlib.sha256(f"{base_url}|{app_key}".encode("utf-8")).hexdigest()[:16]
+
+
+class _TokenCacheLock:
+    """
+    토큰 캐시 파일용 프로세스 간 배타 잠금.
+    병렬 CLI 실행이 동시에 토큰을 재발급하지 않도록 한다. (fcntl 없으면 no-op)
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path.with_name(path.name + ".lock")
+        self._fh = None
+
+    def __enter__(self) -> "_TokenCacheLock":
+        if fcntl is None:
+            return self
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self._path, "a")
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)
+        except OSError as e:
+            # 잠금 실패 시 캐시 없이 진행 (토큰 발급 자체는 막지 않음)
+            print(f"[kis_downloader] 토큰 캐시 잠금 실패 (무시): {e}")
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._fh is not None:
+            fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)
+            self._fh.close()
+            self._fh = None
+
+
+def _read_token_cache(path: Path) -> dict:
+    try:
+        data = json_loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _load_cached_token(path: Path, key: str) -> str | None:
+    """만료 TOKEN_EXPIRY_MARGIN_SEC 전까지 유효한 캐시 토큰 반환"""
+    entry = _read_token_cache(path).get(key)
+    if not isinstance(entry, dict):
+        return None
+    token = entry.get("token")
+    try:
+        expires_at = float(entry.get("expires_at", 0))
+    except (TypeError, ValueError):
+        return None
+    if token and time.time() < expires_at - TOKEN_EXPIRY_MARGIN_SEC:
+        return str(token)
+    return None
+
+
+def _save_cached_token(path: Path, key: str, token: str, expires_at: float) -> None:
+    """임시 파일에 쓰고 os.replace로 교체 (원자적), 권한 0600"""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        cache = _read_token_cache(path)
+        cache[key] = {"token": token, "expires_at": expires_at}
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(json_dumps_bytes(cache))
+        os.chmod(tmp, 0o600)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[kis_downloader] 토큰 캐시 저장 실패 (무시): {e}")
+
+
+def _token_expires_at(data: dict) -> float:
+    """
+    토큰 응답에서 만료 시각(epoch) 계산.
+    - expires_in(초) 우선, 없으면 access_token_token_expired("YYYY-MM-DD HH:MM:SS")
+    """
+    try:
+        return time.time() + float(data["expires_in"])
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        dt = datetime.strptime(str(data["access_token_token_expired"]), "%Y-%m-%d %H:%M:%S")
+        return dt.timestamp()
+    except (KeyError, ValueError):
+        return time.time() + TOKEN_DEFAULT_TTL_SEC
+
+
+def _to_float_col(raw: pd.DataFrame, col: str) -> pd.Series | float:
+    """응답 컬럼을 float로 일괄 변환 (빈 문자열/누락은 0.0)"""
+    if col not in raw.columns:
+        return 0.0
+    return pd.to_numeric(raw[col], errors="coerce").fillna(0.0)
 
 
 # --------------------------------------------------
@@ -74,7 +198,13 @@ class KoreaInvestDataClient:
     주문/계좌 관련은 broker.korea_invest_api.py에서 따로 처리한다.
     """
 
-    def __init__(self, secrets: KISSecrets) -> None:
+    def __init__(
+        self,
+        secrets: KISSecrets,
+        *,
+        access_token: str | None = None,
+        rate_limiter: "RequestRateLimiter | None" = None,
+    ) -> None:
         self._secrets = secrets
 
         # 모의투자 vs 실전 도메인 결정
@@ -85,20 +215,45 @@ class KoreaInvestDataClient:
         else:
             self._base_url = "https://openapi.koreainvestment.com:9443"
 
-        self._access_token: str | None = None
+        # access_token을 넘기면 발급 없이 재사용 (멀티스레드 다운로드 시 토큰 공유)
+        self._access_token: str | None = access_token
+        # tr_id -> 헤더 dict (발급 토큰 기준 캐시)
+        self._header_templates: Dict[str, dict] = {}
+        self._header_token: str | None = None
+        # 같은 호스트로의 연속 호출은 keep-alive 커넥션 풀을 재사용 (TLS 핸드셰이크 절감)
+        # 5xx는 어댑터 레벨에서 지수 백오프(0.3s, 0.6s, 1.2s ...)로 재시도.
+        # raise_on_status=False: 재시도 소진 시 마지막 응답을 돌려받아 _request에서 에러 로깅
+        retry = Retry(
+            total=5,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False,
+        )
         self._session = requests.Session()
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retry),
+        )
+        self._rate_limiter = rate_limiter
         
     # -----------------------
     # http 중복 코드 공통화
     # -----------------------
 
+    def _throttle(self) -> None:
+        if self._rate_limiter is not None:
+            self._rate_limiter.wait()
+
     def _request(self, method: str, url: str, headers: dict, params=None, data=None):
-        resp = self._session.request(method, url, headers=headers, params=params, data=data)
+        resp = self._session.request(
+            method, url, headers=headers, params=params, data=data, timeout=REQUEST_TIMEOUT
+        )
         
         if resp.status_code != 200:
             # JSON 메시지 추출 시도
             try:
-                err = resp.json()
+                err = json_loads(resp.content)
                 print(
                     f"[KIS ERROR] status={resp.status_code} "
                     f"msg_cd={err.get('msg_cd')} "
@@ -110,34 +265,43 @@ class KoreaInvestDataClient:
 
             resp.raise_for_status()
 
-        # 정상
-        return resp.json()
+        # 정상 (orjson 사용 가능 시 bytes에서 바로 디코딩)
+        return json_loads(resp.content)
     # ----------------------------
     # OAuth 토큰 발급
     # ----------------------------
     def _ensure_access_token(self) -> str:
         """
-        access_token이 없으면 발급, 있으면 기존 것 사용.
-        (프로토타입 단계에서는 한 번 발급 후 그대로 재사용한다고 가정)
+        access_token이 없으면 디스크 캐시(TOKEN_CACHE_PATH) 확인 후, 없거나 만료 임박이면 발급.
+        발급한 토큰은 캐시에 저장해 다음 실행에서 재사용한다.
         """
         if self._access_token is not None:
             return self._access_token
 
-        url = f"{self._base_url}/oauth2/tokenP"
-        headers = {"content-type": "application/json; charset=utf-8"}
-        body = {
-            "grant_type": "client_credentials",
-            "appkey": self._secrets.app_key,
-            "appsecret": self._secrets.app_secret,
-        }
+        key = _token_cache_key(self._base_url, self._secrets.app_key)
+        with _TokenCacheLock(TOKEN_CACHE_PATH):
+            cached = _load_cached_token(TOKEN_CACHE_PATH, key)
+            if cached is not None:
+                self._access_token = cached
+                return cached
+
+            url = f"{self._base_url}/oauth2/tokenP"
+            headers = {"content-type": "application/json; charset=utf-8"}
+            body = {
+                "grant_type": "client_credentials",
+                "appkey": self._secrets.app_key,
+                "appsecret": self._secrets.app_secret,
+            }
+
+            resp = self._session.post(url, headers=headers, data=json_dumps_bytes(body), timeout=5)
+            resp.raise_for_status()
+            data = json_loads(resp.content)
 
-        resp = self._session.post(url, headers=headers, data=json.dumps(body), timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
+            access_token = data.get("access_token")
+            if not access_token:
+                raise RuntimeError(f"토큰 발급 실패: {data}")
 
-        access_token = data.get("access_token")
-        if not access_token:
-            raise RuntimeError(f"토큰 발급 실패: {data}")
+            _save_cached_token(TOKEN_CACHE_PATH, key, access_token, _token_expires_at(data))
 
         self._access_token = access_token
         return access_token
@@ -147,15 +311,27 @@ class KoreaInvestDataClient:
     # 공통 헤더 구성
     # ----------------------------
     def _headers(self, tr_id: str) -> dict:
+        """
+        tr_id별 헤더 템플릿 (토큰이 바뀔 때만 다시 만든다).
+        반환 dict는 재사용되므로 호출부에서 수정하지 말 것.
+        """
         token = self._ensure_access_token()
-        return {
-            "content-type": "application/json; charset=utf-8",
-            "authorization": f"Bearer {token}",
-            "appkey": self._secrets.app_key,
-            "appsecret": self._secrets.app_secret,
-            "tr_id": tr_id,
-            "custtype": "P",  # 개인
-        }
+        if token != self._header_token:
+            self._header_templates.clear()
+            self._header_token = token
+
+        headers = self._header_templates.get(tr_id)
+        if headers is None:
+            headers = {
+                "content-type": "application/json; charset=utf-8",
+                "authorization": f"Bearer {token}",
+                "appkey": self._secrets.app_key,
+                "appsecret": self._secrets.app_secret,
+                "tr_id": tr_id,
+                "custtype": "P",  # 개인
+            }
+            self._header_templates[tr_id] = headers
+        return headers
 
     # ----------------------------
     # 1) 국내주식 기간별 시세(일봉) 조회
@@ -194,46 +370,34 @@ class KoreaInvestDataClient:
             
 
         
-            resp = safe_request_with_retry(
-                self._session,
-                url,
-                headers=headers,
-                params=params,
-                max_retry=5,
-                sleep_sec=0.3,
-            )
-            data = resp.json()
+            self._throttle()
+            data = self._request("GET", url, headers=headers, params=params)
             output_list = data.get("output2") or data.get("output") or []
             if not output_list:
                 break
 
 
-            rows = []
-            for row in output_list:
-                date_str = row.get("stck_bsop_date")
-                if not date_str:
-                    continue
-
-                try:
-                    d = datetime.strptime(date_str, "%Y%m%d").date()
-                except ValueError:
-                    continue
-                rows.append(
-                    {
-                        "date": d,
-                        "open": float(row.get("stck_oprc", 0) or 0),
-                        "high": float(row.get("stck_hgpr", 0) or 0),
-                        "low": float(row.get("stck_lwpr", 0) or 0),
-                        "close": float(row.get("stck_clpr", 0) or 0),
-                        "volume": float(row.get("acml_vol", 0) or 0),
-                    }
-                )
-        
-            chunk = pd.DataFrame(rows)
+            # 컬럼 단위 일괄 파싱 (행마다 dict/strptime 생성하지 않음)
+            raw = pd.DataFrame(output_list)
+            if "stck_bsop_date" not in raw.columns:
+                break
+
+            chunk = pd.DataFrame(
+                {
+                    "date": pd.to_datetime(raw["stck_bsop_date"], format="%Y%m%d", errors="coerce"),
+                    "open": _to_float_col(raw, "stck_oprc"),
+                    "high": _to_float_col(raw, "stck_hgpr"),
+                    "low": _to_float_col(raw, "stck_lwpr"),
+                    "close": _to_float_col(raw, "stck_clpr"),
+                    "volume": _to_float_col(raw, "acml_vol"),
+                }
+            )
+            chunk = chunk.dropna(subset=["date"])
             if chunk.empty:
                 break
 
-            chunk = chunk.sort_values("date").reset_index(drop=True)
+            chunk["date"] = chunk["date"].dt.date
+            chunk = chunk.sort_values("date", ignore_index=True)
             oldest = chunk["date"].iloc[0]
             newest = chunk["date"].iloc[-1]
             all_rows.append(chunk)
@@ -271,16 +435,8 @@ class KoreaInvestDataClient:
             "FID_INPUT_ISCD": symbol,        # 6자리 종목코드
         }
 
-        self._ensure_access_token()
-        resp = safe_request_with_retry(
-            self._session,
-            url,
-            headers=headers,
-            params=params,
-            max_retry=5,
-            sleep_sec=0.3,
-        )
-        data = resp.json()
+        self._throttle()
+        data = self._request("GET", url, headers=headers, params=params)
 
         output = data.get("output", [])
         if isinstance(output, dict):
@@ -395,20 +551,41 @@ class KoreaInvestDataClient:
 # --------------------------------------------------
 # CSV 저장 유틸 (원하면 다른 곳에서도 재사용 가능)
 # --------------------------------------------------
+def _normalize_date_str(df: pd.DataFrame) -> pd.DataFrame:
+    """date를 'YYYY-MM-DD' 문자열로 통일한 복사본 반환"""
+    out = df.copy()
+    if pd.api.types.is_datetime64_any_dtype(out["date"]):
+        out["date"] = out["date"].dt.date.astype(str)
+    else:
+        out["date"] = out["date"].astype(str)
+    return out
+
+
 def save_df_to_raw_csv(symbol: str, df: pd.DataFrame) -> Path:
     RAW_DIR.mkdir(parents=True, exist_ok=True)
     path = RAW_DIR / f"{symbol}.csv"
 
-    df_to_save = df.copy()
-    df_to_save.to_csv(path, index=False, encoding="utf-8-sig")
-    
     # date를 문자열로 통일
-    if pd.api.types.is_datetime64_any_dtype(df_to_save["date"]):
-        df_to_save["date"] = df_to_save["date"].dt.date.astype(str)
-    else:
-        df_to_save["date"] = df_to_save["date"].astype(str)
+    df_to_save = _normalize_date_str(df)
 
-    df_to_save.to_csv(path, index=False, encoding="utf-8-sig")
+    # 한 번만 기록 (OS와 무관하게 LF 줄바꿈)
+    df_to_save.to_csv(path, index=False, encoding="utf-8-sig", lineterminator="\n")
+    print(f"[kis_downloader] saved: {path} (rows={len(df_to_save)})")
+    return path
+
+
+def save_df_to_raw_parquet(symbol: str, df: pd.DataFrame) -> Path:
+    """
+    raw/{symbol}.parquet 저장 (pyarrow, zstd 압축).
+    타입이 보존되므로 로딩 시 문자열 파싱이 필요 없다.
+    """
+    RAW_DIR.mkdir(parents=True, exist_ok=True)
+    path = RAW_DIR / f"{symbol}.parquet"
+
+    df_to_save = df.copy()
+    df_to_save["date"] = pd.to_datetime(df_to_save["date"])
+
+    df_to_save.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
     print(f"[kis_downloader] saved: {path} (rows={len(df_to_save)})")
     return path
 
@@ -420,7 +597,8 @@ def download_and_save_symbol(
     end_date: str,
 ) -> Path | None:
     """
-    심볼 하나에 대해 KIS에서 데이터를 조회해 raw/{symbol}.csv로 저장.
+    심볼 하나에 대해 KIS에서 데이터를 조회해 raw/{symbol}.parquet로 저장.
+    (pyarrow가 없으면 raw/{symbol}.csv)
     - start_date, end_date: YYYYMMDD
     """
     df = client.fetch_ohlcv_with_foreign(symbol, start=start_date, end=end_date)
@@ -428,49 +606,81 @@ def download_and_save_symbol(
         print(f"[kis_downloader] {symbol}: 조회 결과 없음 (저장 생략).")
         return None
 
+    if _HAS_PYARROW:
+        return save_df_to_raw_parquet(symbol, df)
     return save_df_to_raw_csv(symbol, df)
 
 from requests import HTTPError
 
+
+class RequestRateLimiter:
+    """
+    스레드 공유 요청 간격 제한기.
+    초당 rate_per_sec 건을 넘지 않도록 각 요청의 시작 시각을 예약한다.
+    """
+
+    def __init__(self, rate_per_sec: float) -> None:
+        if rate_per_sec <= 0:
+            raise ValueError(f"rate_per_sec must be positive: {rate_per_sec}")
+        self._interval = 1.0 / rate_per_sec
+        self._lock = threading.Lock()
+        self._next_at = time.monotonic()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(self._next_at, now)
+            self._next_at = start_at + self._interval
+        delay = start_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+
 def download_and_save_symbols(
     symbols: List[str],
     start_date: str,
     end_date: str,
+    *,
+    max_workers: int = 8,
+    rate_per_sec: float | None = None,
 ) -> None:
     """
-    여러 심볼에 대해 순차적으로 다운로드 + 저장.
+    여러 심볼에 대해 병렬(스레드)로 다운로드 + 저장.
+
+    - requests.Session은 스레드 간 공유가 안전하지 않으므로 스레드마다 클라이언트 1개
+    - access_token은 한 번만 발급해서 공유 (KIS 토큰 발급 빈도 제한 대응)
+    - rate_per_sec를 주면 전체 스레드 합산 초당 요청 수를 제한
     """
     secrets = load_kis_secrets()
-    client = KoreaInvestDataClient(secrets)
-
-    for sym in symbols:
-        try:
-            print(f"[kis_downloader] {sym}: 일봉 + 투자자매매동향 조회 시작...")
-            download_and_save_symbol(client, sym, start_date, end_date)
-        except HTTPError as e:
-            status = e.response.status_code
-            print(f"[kis_downloader] {sym}: HTTP {status} 에러 -> {e}")
-            if status >= 500:
-                print(f"[kis_downloader] {sym}: 서버 내부 오류이므로 이 종목은 건너뜁니다.")
-        except Exception as e:
-            print(f"[kis_downloader] {sym}: 일반 예외 발생 -> {e}")
-
-import time
-import requests
-
-def safe_request_with_retry(session, url, headers, params, max_retry=3, sleep_sec=0.3):
-    for i in range(max_retry):
-        resp = session.get(url, headers=headers, params=params)
-        if resp.status_code == 200:
-            return resp
-        if 500 <= resp.status_code < 600:
-            # 서버 에러이면 잠깐 쉬었다가 재시도
-            time.sleep(sleep_sec)
-            continue
-        # 그 외 에러(400, 401 등)는 바로 반환
-        resp.raise_for_status()
-    # 여기까지 왔다는 건 max_retry 번 다 실패
-    resp.raise_for_status()
+    limiter = RequestRateLimiter(rate_per_sec) if rate_per_sec else None
+    token = KoreaInvestDataClient(secrets)._ensure_access_token()
+
+    local = threading.local()
+
+    def _client() -> KoreaInvestDataClient:
+        client = getattr(local, "client", None)
+        if client is None:
+            client = KoreaInvestDataClient(secrets, access_token=token, rate_limiter=limiter)
+            local.client = client
+        return client
+
+    def _job(sym: str) -> Path | None:
+        print(f"[kis_downloader] {sym}: 일봉 + 투자자매매동향 조회 시작...")
+        return download_and_save_symbol(_client(), sym, start_date, end_date)
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as ex:
+        futures = {ex.submit(_job, sym): sym for sym in symbols}
+        for fut in as_completed(futures):
+            sym = futures[fut]
+            try:
+                fut.result()
+            except HTTPError as e:
+                status = e.response.status_code
+                print(f"[kis_downloader] {sym}: HTTP {status} 에러 -> {e}")
+                if status >= 500:
+                    print(f"[kis_downloader] {sym}: 서버 내부 오류이므로 이 종목은 건너뜁니다.")
+            except Exception as e:
+                print(f"[kis_downloader] {sym}: 일반 예외 발생 -> {e}")
 
 # --------------------------------------------------
 # CLI 진입점
@@ -498,9 +708,27 @@ def main() -> None:
         required=True,
         help="조회 종료일 (YYYYMMDD)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="동시 다운로드 스레드 수 (default: 8)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="(옵션) 전체 초당 최대 요청 수 (KIS 호출 제한 대응)",
+    )
 
     args = parser.parse_args()
-    download_and_save_symbols(args.symbols, args.start, args.end)
+    download_and_save_symbols(
+        args.symbols,
+        args.start,
+        args.end,
+        max_workers=args.workers,
+        rate_per_sec=args.rate,
+    )
 
 
 if __name__ == "__main__":
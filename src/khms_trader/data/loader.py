@@ -1,16 +1,32 @@
 from __future__ import annotations
 
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Sequence
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa  # parquet 캐시 / CSV 리더용, 선택 의존성
+    import pyarrow.csv as pa_csv
+    _HAS_PYARROW = True
+except ImportError:  # pragma: no cover
+    pa = None  # type: ignore
+    pa_csv = None  # type: ignore
+    _HAS_PYARROW = False
+
 # 프로젝트 루트 디렉터리 계산
 # 예: /.../khms_trader/src/khms_trader/data/loader.py -> /.../khms_trader
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DATA_DIR = ROOT_DIR / "data"
 PROCESSED_DIR = DATA_DIR / "processed"
 RAW_DIR = DATA_DIR / "raw"
+# CSV 파싱 결과 parquet 캐시 (git 제외, 지워도 됨): data/cache/{processed|raw}/{symbol}.parquet
+CACHE_DIR = DATA_DIR / "cache"
 
 # 만약 CSV 컬럼명이 다르다면 여기서 매핑을 수정하면 된다.
 # 예: '날짜' -> 'date', '종가' -> 'close' 등
@@ -25,13 +41,30 @@ COLUMN_ALIASES = {
 }
 
 
-def _find_first_existing_column(columns: Sequence[str], candidates: Sequence[str]) -> Optional[str]:
-    """주어진 candidates 중 실제 DataFrame 컬럼에 존재하는 첫 번째 컬럼명을 반환."""
-    col_set = set(columns)
-    for name in candidates:
-        if name in col_set:
-            return name
-    return None
+# 별칭 -> (표준 이름, COLUMN_ALIASES 안 우선순위) 역방향 매핑 (모듈 로드 시 1회 구성)
+_ALIAS_TO_STANDARD: dict[str, tuple[str, int]] = {
+    alias: (std_name, rank)
+    for std_name, aliases in COLUMN_ALIASES.items()
+    for rank, alias in enumerate(aliases)
+}
+
+
+def _resolve_aliases(columns: Sequence[str]) -> dict[str, str]:
+    """
+    실제 컬럼명 -> 표준 이름 매핑을 컬럼 1회 순회로 구성.
+    같은 표준 이름에 여러 별칭이 있으면 COLUMN_ALIASES 순서상 앞선 별칭을 쓴다.
+    (예: '날짜'와 'date'가 함께 있으면 'date')
+    """
+    best: dict[str, tuple[int, str]] = {}  # 표준 이름 -> (우선순위, 실제 컬럼명)
+    for col in columns:
+        hit = _ALIAS_TO_STANDARD.get(col)
+        if hit is None:
+            continue
+        std_name, rank = hit
+        cur = best.get(std_name)
+        if cur is None or rank < cur[0]:
+            best[std_name] = (rank, col)
+    return {col: std_name for std_name, (_, col) in best.items()}
 
 
 def _standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
@@ -41,14 +74,9 @@ def _standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
     기대 최종 컬럼:
         - date, open, high, low, close, volume, foreign_net_buy
     """
-    df = df.copy()
-    rename_map: dict[str, str] = {}
-
-    for std_name, aliases in COLUMN_ALIASES.items():
-        found = _find_first_existing_column(df.columns, aliases)
-        if found is not None and found != std_name:
-            rename_map[found] = std_name
-
+    rename_map = {
+        col: std_name for col, std_name in _resolve_aliases(df.columns).items() if col != std_name
+    }
     if rename_map:
         df = df.rename(columns=rename_map)
 
@@ -61,6 +89,68 @@ def _standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _finalize_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """컬럼 표준화 + date datetime 변환 + date index 오름차순 정렬"""
+    # 컬럼 표준화
+    df = _standardize_columns(df)
+
+    # date를 datetime으로 변환
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.sort_values("date").set_index("date")
+
+    return df
+
+
+def _read_ohlcv_csv_fast(path: Path) -> Optional[pd.DataFrame]:
+    """
+    C 엔진 + 명시적 dtype + 읽기 시점 date 파싱.
+    헤더만 먼저 읽어(nrows=0) 별칭 컬럼을 찾고, 필요한 컬럼만 usecols로 로드한다.
+    필수 컬럼을 못 찾으면 None.
+    """
+    header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+
+    found = {std_name: col for col, std_name in _resolve_aliases(header).items()}
+    if len(found) < len(COLUMN_ALIASES):
+        return None
+
+    date_col = found.pop("date")
+    return pd.read_csv(
+        path,
+        encoding="utf-8-sig",
+        engine="c",
+        usecols=[date_col, *found.values()],
+        dtype={col: "float64" for col in found.values()},
+        parse_dates=[date_col],
+        date_format="%Y-%m-%d",
+    )
+
+
+def _read_ohlcv_csv_arrow(path: Path) -> Optional[pd.DataFrame]:
+    """
+    pyarrow 멀티스레드 CSV 리더 경로. (pyarrow 필요)
+    _read_ohlcv_csv_fast와 같은 방식으로 헤더의 별칭 컬럼만 골라 float64 / timestamp로 바로 변환.
+    필수 컬럼을 못 찾으면 None, 깨진 행이 있으면 pa.ArrowInvalid.
+    """
+    header = pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns
+
+    found = {std_name: col for col, std_name in _resolve_aliases(header).items()}
+    if len(found) < len(COLUMN_ALIASES):
+        return None
+
+    date_col = found.pop("date")
+    column_types = {col: pa.float64() for col in found.values()}
+    column_types[date_col] = pa.timestamp("ns")
+    table = pa_csv.read_csv(
+        path,
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=[date_col, *found.values()],
+            column_types=column_types,
+            timestamp_parsers=["%Y-%m-%d"],
+        ),
+    )
+    return table.to_pandas(self_destruct=True)
+
+
 def _read_ohlcv_csv(path: Path) -> pd.DataFrame:
     """
     OHLCV + foreign_net_buy CSV 파일을 읽어온다.
@@ -72,22 +162,168 @@ def _read_ohlcv_csv(path: Path) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"CSV file not found: {path}")
 
-    # date 컬럼명을 아직 모르므로 parse_dates는 읽고 나서 처리
-    df = pd.read_csv(
-        path,
-        encoding="utf-8-sig",
-        engine="python",
-        on_bad_lines="skip",
-    )
+    df = None
+    if _HAS_PYARROW:
+        try:
+            df = _read_ohlcv_csv_arrow(path)
+        except (ValueError, pa.ArrowInvalid):
+            df = None
 
-    # 컬럼 표준화
-    df = _standardize_columns(df)
+    try:
+        if df is None:
+            df = _read_ohlcv_csv_fast(path)
+    except (ValueError, pd.errors.ParserError):
+        # 깨진 행/숫자 아닌 값이 섞인 파일
+        df = None
 
-    # date를 datetime으로 변환
-    df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values("date").set_index("date")
+    if df is None:
+        # 느리지만 관대한 경로: python 엔진 + 깨진 행 건너뛰기
+        df = pd.read_csv(
+            path,
+            encoding="utf-8-sig",
+            engine="python",
+            on_bad_lines="skip",
+        )
 
-    return df
+    return _finalize_ohlcv(df)
+
+
+# tail 읽기 시 행당 넉넉히 잡는 바이트 수 (실제 행은 ~60바이트)
+_TAIL_BYTES_PER_ROW = 128
+
+
+def _read_ohlcv_csv_tail(path: Path, n_rows: int) -> pd.DataFrame:
+    """
+    날짜 오름차순(append 순서)으로 저장된 CSV의 마지막 n_rows 행만 읽는다.
+
+    - 헤더 한 줄 + 파일 끝쪽 바이트만 읽어 파싱 (파일 길이와 무관한 비용)
+    - 잘린 첫 행은 버림
+    - 행이 모자라거나 파싱에 실패하면 전체 파일을 읽는 _read_ohlcv_csv로 대체
+    """
+    try:
+        with open(path, "rb") as f:
+            header = f.readline()
+            size = f.seek(0, os.SEEK_END)
+            start = max(len(header), size - _TAIL_BYTES_PER_ROW * (n_rows + 1))
+            f.seek(start)
+            chunk = f.read()
+
+        truncated = start > len(header)
+        if truncated:
+            chunk = chunk.split(b"\n", 1)[1] if b"\n" in chunk else b""
+
+        df = _finalize_ohlcv(pd.read_csv(io.BytesIO(header + chunk), encoding="utf-8-sig"))
+        if not truncated or len(df) >= n_rows:
+            return df.tail(n_rows)
+    except (ValueError, KeyError, pd.errors.ParserError):
+        pass
+
+    return _read_ohlcv_csv(path).tail(n_rows)
+
+
+def _read_ohlcv_parquet(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    OHLCV + foreign_net_buy Parquet 파일을 읽어온다. (pyarrow 필요)
+    타입이 저장되어 있어 CSV 대비 문자열 파싱 비용이 없다.
+
+    columns를 주면 date + 해당 컬럼만 읽는다. (표준 컬럼명으로 저장된 파일 전제)
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Parquet file not found: {path}")
+
+    if columns is not None:
+        df = pd.read_parquet(path, engine="pyarrow", columns=["date", *columns])
+        df["date"] = pd.to_datetime(df["date"])
+        return df.sort_values("date").set_index("date")
+
+    df = pd.read_parquet(path, engine="pyarrow")
+    return _finalize_ohlcv(df)
+
+
+def _parquet_cache_path(csv_path: Path) -> Path:
+    """data/raw/005930.csv -> data/cache/raw/005930.parquet"""
+    return CACHE_DIR / csv_path.parent.name / f"{csv_path.stem}.parquet"
+
+
+def _write_parquet_cache(csv_path: Path, df: pd.DataFrame) -> None:
+    """
+    CSV를 파싱한 결과를 data/cache/ 아래 {symbol}.parquet(zstd)로 저장. (데이터 폴더는 건드리지 않음)
+    다음 로드부터는 parquet 캐시가 우선 선택된다. (CSV가 더 새로우면 다시 CSV)
+    실패해도 로드 자체에는 영향 없음.
+    """
+    if not _HAS_PYARROW:
+        return
+    try:
+        out = _parquet_cache_path(csv_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        df.reset_index().to_parquet(out, engine="pyarrow", compression="zstd", index=False)
+    except Exception as e:
+        print(f"[loader] parquet cache write failed: {csv_path} -> {e}")
+
+
+def _read_ohlcv_file(path: Path, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """
+    확장자(.parquet / .csv)에 따라 알맞은 리더로 로드.
+    columns는 parquet에서만 사용 (CSV는 항상 전체 컬럼).
+    """
+    if path.suffix == ".parquet":
+        return _read_ohlcv_parquet(path, columns=columns)
+    return _read_ohlcv_csv(path)
+
+
+def _ohlcv_candidates(symbol: str, *, use_processed: bool = True) -> list[Path]:
+    """
+    심볼 데이터 파일 후보 (우선순위 순).
+    같은 디렉터리 안에서는 parquet -> CSV의 parquet 캐시(data/cache) -> csv 순으로 시도한다.
+    단, 같은 이름의 CSV가 parquet보다 새로우면(수정됨) parquet은 건너뛴다.
+    """
+    dirs = [PROCESSED_DIR, RAW_DIR] if use_processed else [RAW_DIR]
+    out: list[Path] = []
+    for d in dirs:
+        csv = d / f"{symbol}.csv"
+        for pq in (d / f"{symbol}.parquet", _parquet_cache_path(csv)):
+            if not _is_stale_parquet(pq, csv):
+                out.append(pq)
+        out.append(csv)
+    return out
+
+
+def _is_stale_parquet(pq: Path, csv: Path) -> bool:
+    try:
+        return csv.stat().st_mtime_ns > pq.stat().st_mtime_ns
+    except OSError:
+        # 둘 중 하나라도 없으면 비교 대상 아님
+        return False
+
+
+def _freeze_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    컬럼별 numpy 배열을 읽기 전용(writeable=False)으로 만든 프레임.
+    공유 캐시를 제자리 수정(df.iloc[...] = ..., df["close"].values[...] = ...)하면 ValueError.
+    """
+    cols = {}
+    for name, col in df.items():
+        if isinstance(col.dtype, np.dtype):
+            arr = col.to_numpy(copy=True)
+            arr.flags.writeable = False
+            cols[name] = arr
+        else:
+            cols[name] = col
+    return pd.DataFrame(cols, index=df.index, copy=False)
+
+
+@lru_cache(maxsize=1024)
+def _read_ohlcv_cached(
+    path_str: str,
+    mtime_ns: int,
+    columns: Optional[tuple[str, ...]] = None,
+) -> pd.DataFrame:
+    """
+    (경로, mtime, 컬럼) 기준 로드 캐시. 파일이 바뀌면 mtime이 달라져 다시 읽는다.
+    캐시된 프레임은 공유 객체라 값 배열을 읽기 전용으로 잠가 둔다.
+    (load_symbol_ohlcv_with_foreign은 얕은 복사본만 내보낸다)
+    """
+    return _freeze_frame(_read_ohlcv_file(Path(path_str), columns=columns))
 
 
 def load_symbol_ohlcv_with_foreign(
@@ -99,25 +335,23 @@ def load_symbol_ohlcv_with_foreign(
     심볼(종목코드)에 해당하는 일봉 + 외국인순매수 데이터를 로드한다.
 
     기본 동작:
-        - data/processed/{symbol}.csv 먼저 시도
-        - 없으면 data/raw/{symbol}.csv 시도
+        - data/processed/{symbol}.parquet|csv 먼저 시도
+        - 없으면 data/raw/{symbol}.parquet|csv 시도
         - 둘 다 없으면 빈 DataFrame 반환
 
     CSV 예상 컬럼:
         - date, open, high, low, close, volume, foreign_net_buy
       (실제 컬럼명이 다르면 COLUMN_ALIASES에서 매핑 설정)
-    """
-    candidates: list[Path] = []
-
-    if use_processed:
-        candidates.append(PROCESSED_DIR / f"{symbol}.csv")
-    candidates.append(RAW_DIR / f"{symbol}.csv")
 
-    for path in candidates:
+    같은 파일(경로 + mtime)은 한 번만 파싱하고 캐시에서 돌려준다.
+    반환값은 캐시와 데이터를 공유하는 얕은 복사본이다. 컬럼 추가/교체는 안전하지만,
+    값 배열이 읽기 전용이라 제자리 수정(df.loc[...] = ...)은 ValueError -> 먼저 df.copy()를 할 것.
+    """
+    for path in _ohlcv_candidates(symbol, use_processed=use_processed):
         try:
             if path.exists():
-                df = _read_ohlcv_csv(path)
-                return df
+                df = _read_ohlcv_cached(str(path), path.stat().st_mtime_ns)
+                return df.copy(deep=False)
         except Exception as e:
             # 로딩 실패 시 경고만 출력하고 다음 후보 시도
             print(f"[loader] failed to load {path}: {e}")
@@ -125,3 +359,30 @@ def load_symbol_ohlcv_with_foreign(
     # 아무 파일도 없거나 모두 실패한 경우
     print(f"[loader] no data found for symbol={symbol}")
     return pd.DataFrame()
+
+
+def load_universe_ohlcv(
+    symbols: Sequence[str],
+    *,
+    use_processed: bool = True,
+) -> pd.DataFrame:
+    """
+    여러 심볼을 (symbol, date) MultiIndex 롱 포맷 DataFrame 하나로 로드한다.
+
+    - 심볼 순서(입력 순서)대로, 심볼 안에서는 date 오름차순으로 행이 연속해서 놓인다.
+    - 데이터가 없는 심볼은 빠진다. (모두 없으면 빈 DataFrame)
+    - 파일 로드는 심볼별로 독립이라 스레드로 병렬 (캐시는 load_symbol_ohlcv_with_foreign과 공유)
+    """
+    symbols = list(dict.fromkeys(symbols))  # 중복 제거 (순서 유지)
+    if not symbols:
+        return pd.DataFrame()
+
+    def _load(symbol: str) -> pd.DataFrame:
+        return load_symbol_ohlcv_with_foreign(symbol, use_processed=use_processed)
+
+    with ThreadPoolExecutor(max_workers=min(16, len(symbols))) as ex:
+        frames = {s: df for s, df in zip(symbols, ex.map(_load, symbols)) if not df.empty}
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, names=["symbol", "date"])
@@ -1,23 +1,35 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
-from pathlib import Path
-from typing import List, Tuple
+from functools import partial
+from typing import List, Optional
 
-import numpy as np
 import pandas as pd
 
-from .loader import PROCESSED_DIR, RAW_DIR, _read_ohlcv_csv
+from .loader import (
+    PROCESSED_DIR,
+    RAW_DIR,
+    _HAS_PYARROW,
+    _ohlcv_candidates,
+    _read_ohlcv_cached,
+    _read_ohlcv_csv_tail,
+    _write_parquet_cache,
+)
+
+# 스크리너 계산에 필요한 컬럼 (parquet은 이 컬럼만 읽는다)
+_SCREEN_COLUMNS = ("close", "volume")
 
 
 def list_available_symbols() -> List[str]:
     """
-    data/processed, data/raw 아래의 CSV 파일명을 스캔해서
+    data/processed, data/raw 아래의 CSV/Parquet 파일명을 스캔해서
     사용 가능한 심볼 목록을 반환한다.
 
     예:
         data/processed/005930.csv -> "005930"
-        data/raw/000660.csv      -> "000660"
+        data/raw/000660.parquet  -> "000660"
     """
     symbols = set()
 
@@ -25,29 +37,52 @@ def list_available_symbols() -> List[str]:
         if not directory.exists():
             continue
 
-        for path in directory.glob("*.csv"):
-            symbols.add(path.stem)
+        # scandir: dirent의 파일 타입을 그대로 써서 파일마다 stat/Path 생성 없이 스캔
+        with os.scandir(directory) as it:
+            for entry in it:
+                name = entry.name
+                if name.startswith("."):
+                    # glob("*.csv")와 동일하게 숨김 파일 제외
+                    continue
+                if name.endswith(".csv"):
+                    stem = name[:-4]
+                elif name.endswith(".parquet"):
+                    stem = name[:-8]
+                else:
+                    continue
+                if entry.is_file(follow_symlinks=False):
+                    symbols.add(stem)
 
     return sorted(symbols)
 
 
-def _load_recent_data(symbol: str, lookback_days: int) -> pd.DataFrame:
+def _load_recent_data(
+    symbol: str, lookback_days: int, write_parquet_cache: bool = False
+) -> pd.DataFrame:
     """
     개별 심볼의 최근 lookback_days 일 데이터를 로드한다.
-    loader._read_ohlcv_csv를 그대로 활용.
+    - parquet: close/volume 컬럼만 읽음
+    - csv: 기본은 파일 끝 lookback_days 행만 읽음.
+      write_parquet_cache=True(+pyarrow)면 전체 파싱 후 data/cache/에 parquet 캐시를 남겨
+      다음 실행부터 parquet으로 읽음 (전체 파싱은 (경로, mtime) 캐시를 거쳐 세션 내 재파싱 없음)
+    - 캐시 프레임을 그대로 받을 수 있으므로 여기서는 슬라이싱만 하고 수정하지 않음
     """
-    # 우선 processed 우선, 없으면 raw
-    candidates: List[Path] = [
-        PROCESSED_DIR / f"{symbol}.csv",
-        RAW_DIR / f"{symbol}.csv",
-    ]
-
-    for path in candidates:
+    # 우선 processed 우선, 없으면 raw (각각 parquet -> csv 순)
+    for path in _ohlcv_candidates(symbol):
         if path.exists():
             try:
-                df = _read_ohlcv_csv(path)
+                mtime_ns = path.stat().st_mtime_ns
+                if path.suffix == ".parquet":
+                    df = _read_ohlcv_cached(str(path), mtime_ns, _SCREEN_COLUMNS)
+                elif write_parquet_cache and _HAS_PYARROW:
+                    # 캐시를 남길 때만 전체 파싱 (다음 실행부터 parquet)
+                    df = _read_ohlcv_cached(str(path), mtime_ns)
+                    _write_parquet_cache(path, df)
+                else:
+                    # 캐시를 남기지 않으면 전체 파싱 대신 끝부분만 읽는다
+                    df = _read_ohlcv_csv_tail(path, lookback_days)
             except Exception as e:
-                print(f"[screener] CSV parse failed: symbol={symbol}, path={path}, err={e}")
+                print(f"[screener] data parse failed: symbol={symbol}, path={path}, err={e}")
                 return pd.DataFrame()
             # 최신 일 기준으로 lookback_days만 슬라이싱
             if len(df) == 0:
@@ -62,12 +97,36 @@ def _load_recent_data(symbol: str, lookback_days: int) -> pd.DataFrame:
     return pd.DataFrame()
 
 
+def _score_frame(long_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    (symbol, date) MultiIndex의 close/volume 긴 테이블에서 심볼별 점수 계산.
+
+    반환 컬럼 (index=symbol): avg_volume, avg_price, volatility, score
+    - volatility: 일간 수익률 표준편차 (첫 행 NaN 제외, ddof=1)
+    """
+    g = long_df.groupby(level="symbol", sort=True)
+    ret = g["close"].pct_change()
+
+    stats = pd.DataFrame(
+        {
+            "avg_volume": g["volume"].mean(),
+            "avg_price": g["close"].mean(),
+            "volatility": ret.groupby(level="symbol", sort=True).std(),
+        }
+    )
+    stats["score"] = stats["avg_volume"] * stats["volatility"]
+    return stats
+
+
 def screen_top_by_volume_volatility(
     *,
     lookback_days: int = 20,
     top_n: int = 20,
     min_price: float = 1_000.0,
     min_avg_volume: float = 10_000.0,
+    max_workers: Optional[int] = None,
+    max_stale_days: Optional[int] = None,
+    write_parquet_cache: bool = False,
 ) -> List[str]:
     """
     거래대금·변동성 기반 자동 스크리너.
@@ -80,50 +139,58 @@ def screen_top_by_volume_volatility(
     - 기본 필터(min_price, min_avg_volume)를 통과하는 심볼 중
     - score = avg_volume * volatility 로 점수를 매겨
     - 상위 top_n 개 심볼을 반환한다.
+
+    max_stale_days를 주면, 마지막 봉이 전체 심볼 중 가장 최신 봉보다
+    max_stale_days일 넘게 오래된 심볼(거래정지/상장폐지 등)은 후보에서 뺀다.
+
+    write_parquet_cache=True면 CSV 파싱 결과를 data/cache/ 아래 parquet으로 남긴다. (기본은 쓰지 않음)
     """
     symbols = list_available_symbols()
     print(f"[screener] 발견된 심볼 수: {len(symbols)}")
 
-    rows: List[Tuple[str, float, float, float]] = []  # (symbol, avg_volume, volatility, score)
-
-    for symbol in symbols:
-        df = _load_recent_data(symbol, lookback_days=lookback_days)
-        if df.empty:
-            continue
-
-        close = df["close"]
-        volume = df["volume"]
-
-        if len(close) < 5:
-            # 데이터가 너무 짧으면 스킵
-            continue
-
-        # 일간 수익률
-        ret = close.pct_change().dropna()
-        volatility = float(ret.std())
-        avg_volume = float(volume.mean())
-        avg_price = float(close.mean())
-
-        # 기본 필터 (너무 싸거나, 거래량이 너무 적은 종목 제외)
-        if avg_price < min_price:
-            continue
-        if avg_volume < min_avg_volume:
-            continue
+    # 심볼별 로드는 서로 독립 -> 스레드 풀로 병렬 처리 (map은 입력 순서 유지)
+    load_fn = partial(
+        _load_recent_data, lookback_days=lookback_days, write_parquet_cache=write_parquet_cache
+    )
+    workers = max_workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        # 데이터가 너무 짧은(5행 미만) 심볼은 제외
+        frames = {
+            sym: df[["close", "volume"]]
+            for sym, df in zip(symbols, ex.map(load_fn, symbols))
+            if len(df) >= 5
+        }
+
+    if frames and max_stale_days is not None:
+        # 이미 로드한 프레임의 마지막 날짜만 비교 (추가 I/O 없음)
+        last_dates = {sym: df.index[-1] for sym, df in frames.items()}
+        cutoff = max(last_dates.values()) - timedelta(days=max_stale_days)
+        stale = [sym for sym, d in last_dates.items() if d < cutoff]
+        if stale:
+            print(f"[screener] 최근 데이터 없는 심볼 제외({len(stale)}개): {stale}")
+            for sym in stale:
+                del frames[sym]
+
+    if not frames:
+        print("[screener] 조건을 만족하는 심볼이 없습니다.")
+        return []
 
-        score = avg_volume * volatility
-        rows.append((symbol, avg_volume, volatility, score))
+    # 한 번의 concat + groupby로 전 심볼 점수 계산
+    stats = _score_frame(pd.concat(frames, names=["symbol", "date"]))
 
-    if not rows:
+    # 기본 필터 (너무 싸거나, 거래량이 너무 적은 종목 제외)
+    stats = stats[(stats["avg_price"] >= min_price) & (stats["avg_volume"] >= min_avg_volume)]
+    if stats.empty:
         print("[screener] 조건을 만족하는 심볼이 없습니다.")
         return []
 
-    df_score = pd.DataFrame(rows, columns=["symbol", "avg_volume", "volatility", "score"])
-    df_score = df_score.sort_values("score", ascending=False)
+    # 전체 정렬 대신 상위 top_n만 선택 (O(N log k), 결과는 score 내림차순)
+    top = stats.nlargest(top_n, "score")
 
     print("[screener] 상위 심볼 예시:")
-    print(df_score.head(min(top_n, 10)))
+    print(top[["avg_volume", "volatility", "score"]].head(min(top_n, 10)))
 
-    top_symbols = df_score["symbol"].head(top_n).tolist()
+    top_symbols = top.index.tolist()
     print(f"[screener] 선택된 심볼({len(top_symbols)}개): {top_symbols}")
 
     return top_symbols
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import List
@@ -8,7 +9,7 @@ import pandas as pd
 from pykrx import stock
 
 from .kis_downloader import download_and_save_symbols
-from .kis_downloader import PROJECT_ROOT, DATA_DIR
+from .kis_downloader import DATA_DIR
 
 
 UNIVERSE_DIR = DATA_DIR / "universe"
@@ -64,20 +65,18 @@ def get_kosdaq_universe_df(config: KosdaqUniverseConfig) -> pd.DataFrame:
         }
     )
 
-    # 2) 종목명 추가
-    names = {
-        t: stock.get_market_ticker_name(t)
-        for t in df["ticker"]
-    }
-    df["name"] = df["ticker"].map(names)
+    # 2) 필터링: 최소 가격, 최소 거래대금 (numpy 배열 단에서 마스크 한 번으로)
+    mask = (df["close"].to_numpy() >= config.min_price) & (
+        df["traded_value"].to_numpy() >= config.min_traded_value
+    )
 
-    # 3) 필터링: 최소 가격, 최소 거래대금
-    df = df[df["close"] >= config.min_price]
-    df = df[df["traded_value"] >= config.min_traded_value]
+    # 3) 거래대금 상위 N개 선택 (전체 정렬 대신 top-k 선택, 결과는 내림차순)
+    df = df.loc[mask].nlargest(config.top_n, "traded_value").reset_index(drop=True)
 
-    # 4) 거래대금 내림차순 정렬 후 상위 N개 선택
-    df = df.sort_values("traded_value", ascending=False).reset_index(drop=True)
-    df = df.head(config.top_n)
+    # 4) 종목명 추가 (필터 통과한 top_n 종목만 조회, pykrx 호출은 HTTP라 스레드로 병렬)
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        names = list(ex.map(stock.get_market_ticker_name, df["ticker"]))
+    df = df.assign(name=names)
 
     # 5) 컬럼 정리
     df = df[["ticker", "name", "close", "volume", "traded_value"]]
@@ -1,8 +1,6 @@
 # 종목당 자본의 X%만 사용, 가격으로 나누기
 from __future__ import annotations
 
-from math import floor
-
 
 def calc_position_size_by_ratio(
     cash: float,
@@ -20,6 +18,10 @@ def calc_position_size_by_ratio(
     if price <= 0 or cash <= 0 or ratio <= 0:
         return 0
 
-    target_cash = cash * ratio
-    qty = floor(target_cash / price)
-    return max(qty, 0)
+    # 원 단위 정수 나눗셈 (큰 금액에서도 float 나눗셈 오차 없음)
+    target_cash = int(cash * ratio)
+    int_price = int(price)
+    if int_price == price:
+        return target_cash // int_price
+    # 소수 가격이면 float 몫 (floor)
+    return int(target_cash // price)
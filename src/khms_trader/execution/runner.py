@@ -1,38 +1,195 @@
 # paper 용 
 from __future__ import annotations
 
-from typing import Optional
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 
 from khms_trader.config import load_settings
 from khms_trader.broker.base import OrderRequest
 from khms_trader.broker.factory import make_broker
-from khms_trader.data.loader import load_symbol_ohlcv_with_foreign
+from khms_trader.data.loader import load_symbol_ohlcv_with_foreign, load_universe_ohlcv
 from khms_trader.data.screener import screen_top_by_volume_volatility
 from khms_trader.execution.risk import calc_position_size_by_ratio
 from khms_trader.strategies.hsms import HSMSStrategy
-from khms_trader.notifications.telegram import TelegramNotifier
 # 텔레그램 모듈 경로는 프로젝트 내부 기준으로 통일
 from khms_trader.notifications.telegram import TelegramNotifier
+from khms_trader.utils.logging_utils import get_logger
+
+# print 대신 큐 로거 (stdout/파일 쓰기는 별도 스레드에서)
+logger = get_logger("khms.runner")
 
 
-def _make_notifier(settings: dict) -> Optional[TelegramNotifier]:
-    tg_cfg = (settings.get("telegram") or {})
+@lru_cache(maxsize=1)
+def _make_notifier() -> Optional[TelegramNotifier]:
+    """
+    한 프로세스 안에서는 설정을 한 번만 읽고 notifier를 재사용.
+    TelegramNotifier는 token/chat_id를 내부에서 load_settings()로 읽는다.
+    """
+    tg_cfg = (load_settings().get("telegram") or {})
     enabled = bool(tg_cfg.get("enabled", False))  # ✅ enable -> enabled로 통일 권장
     if not enabled:
         return None
-    return TelegramNotifier(
-        token=str(tg_cfg.get("token", "")),
-        chat_id=str(tg_cfg.get("chat_id", "")),
+    return TelegramNotifier()
+
+
+# 마지막 봉 신호 캐시: 같은 일봉 데이터로 여러 번 tick이 돌 때 전체 재계산 생략
+_SIGNAL_CACHE_SIZE = 256
+_signal_cache: "OrderedDict[tuple, pd.Series]" = OrderedDict()
+_signal_cache_lock = threading.Lock()
+
+
+def _signal_key(strategy: Any, symbol: str, last_row: pd.Series, n_rows: int) -> Optional[tuple]:
+    """
+    신호 캐시 키: (전략 종류/설정, symbol, 마지막 봉 시각, 행 수, 마지막 봉 값)
+    숫자가 아닌 컬럼이 섞여 키를 못 만들면 None (캐시 없이 계산).
+    """
+    try:
+        last_values = last_row.to_numpy(dtype=np.float64).tobytes()
+    except (TypeError, ValueError):
+        return None
+    last_index = last_row.name[-1] if isinstance(last_row.name, tuple) else last_row.name
+    return (
+        type(strategy).__name__,
+        repr(getattr(strategy, "config", None)),
+        symbol,
+        last_index,
+        n_rows,
+        last_values,
+    )
+
+
+def _cache_get(key: Optional[tuple]) -> Optional[pd.Series]:
+    if key is None:
+        return None
+    with _signal_cache_lock:
+        row = _signal_cache.get(key)
+        if row is not None:
+            _signal_cache.move_to_end(key)
+        return row
+
+
+def _cache_put(key: Optional[tuple], row: pd.Series) -> None:
+    if key is None:
+        return
+    with _signal_cache_lock:
+        _signal_cache[key] = row
+        if len(_signal_cache) > _SIGNAL_CACHE_SIZE:
+            _signal_cache.popitem(last=False)
+
+
+def _last_signal_row(strategy: Any, symbol: str, df: pd.DataFrame) -> pd.Series:
+    """
+    strategy.generate_signals(df).iloc[-1] (LRU 캐시).
+    새 봉이 붙거나 마지막 봉 값이 바뀌면 키가 달라져 자동으로 다시 계산한다.
+    """
+    key = _signal_key(strategy, symbol, df.iloc[-1], len(df))
+    row = _cache_get(key)
+    if row is None:
+        row = strategy.generate_signals(df).iloc[-1]
+        _cache_put(key, row)
+    return row
+
+
+def _row_summary(last: pd.Series) -> Tuple[Any, float, bool, bool]:
+    """마지막 봉 신호 행 -> (last_date, price, buy_signal, sell_signal)"""
+    # loader가 date index면 그대로, 아니면 date 컬럼 처리 필요할 수 있음
+    return (
+        last.name,
+        float(last["close"]),
+        bool(last.get("buy_signal", False)),
+        bool(last.get("sell_signal", False)),
     )
 
 
+def _prepare_symbol(
+    strategy: HSMSStrategy, symbol: str
+) -> Tuple[str, Optional[Tuple[Any, float, bool, bool]], Optional[str]]:
+    """
+    읽기 전용 단계 (broker 호출 없음): 데이터 로드 + 마지막 봉 신호 계산.
+    반환: (symbol, (last_date, price, buy_signal, sell_signal) | None, error)
+    데이터가 없으면 (symbol, None, None).
+    """
+    try:
+        df = load_symbol_ohlcv_with_foreign(symbol)
+        if df is None or df.empty:
+            return symbol, None, None
+
+        return symbol, _row_summary(_last_signal_row(strategy, symbol, df)), None
+
+    except Exception as e:
+        return symbol, None, str(e)
+
+
+def _prepare_universe(
+    strategy: HSMSStrategy, symbols: list[str]
+) -> list[Tuple[str, Optional[Tuple[Any, float, bool, bool]], Optional[str]]]:
+    """
+    유니버스 전체를 (symbol, date) 프레임 하나로 로드해 마지막 봉 신호 계산.
+    - 신호 캐시(_last_signal_row와 같은 키)에 있는 심볼은 재계산하지 않고,
+      나머지만 모아 generate_signals 한 번으로 계산한 뒤 캐시에 채운다.
+    반환 형식은 _prepare_symbol과 같다. (스크리너 순서 유지, 데이터 없는 심볼은 (symbol, None, None))
+    """
+    uni = load_universe_ohlcv(symbols)
+    if uni.empty:
+        return [(s, None, None) for s in symbols]
+
+    by_symbol = uni.groupby(level="symbol", sort=False)
+    tails = by_symbol.tail(1)
+    sizes = by_symbol.size()
+
+    rows: dict[str, pd.Series] = {}
+    keys: dict[str, Optional[tuple]] = {}
+    for i, (sym, _) in enumerate(tails.index):
+        key = _signal_key(strategy, sym, tails.iloc[i], int(sizes[sym]))
+        cached = _cache_get(key)
+        if cached is not None:
+            rows[sym] = cached
+        else:
+            keys[sym] = key
+
+    if keys:
+        misses = list(keys)
+        sub = uni if len(misses) == len(tails) else uni.loc[misses]
+        last = strategy.generate_signals(sub).groupby(level="symbol", sort=False).tail(1)
+        for i, (sym, last_date) in enumerate(last.index):
+            # 심볼별 경로(iloc[-1])와 같은 모양: name = 마지막 봉 날짜
+            row = last.iloc[i].rename(last_date)
+            _cache_put(keys[sym], row)
+            rows[sym] = row
+
+    return [(s, _row_summary(rows[s]) if s in rows else None, None) for s in symbols]
+
+
+def _warm_broker() -> Any:
+    """
+    브로커 생성 + warm_up() (KIS면 접근 토큰 미리 발급). 스크리너와 병렬로 돌려 첫 잔고 조회 대기를 줄인다.
+    준비(warm_up) 실패는 로그만 남긴다. (KIS는 실제 조회 시 토큰 발급을 다시 시도)
+    """
+    broker = make_broker()
+    try:
+        broker.warm_up()
+    except Exception as e:
+        logger.warning(f"[runner] 브로커 사전 준비 실패 (조회 시 재시도): {e}")
+    return broker
+
+
 def run_paper_trading_auto_universe() -> None:
     """
     설정(setting+secrets 병합) 기반으로 broker를 만들고,
     스크리너 → 전략 시그널 → 주문(또는 페이퍼 주문)을 수행.
     """
-    settings = load_settings()
-    notifier = _make_notifier(settings)
+    notifier = _make_notifier()
+
+    # 브로커 준비(설정 로드 + 토큰 발급)는 스크리너(디스크 I/O)와 겹쳐서 백그라운드로
+    warm_ex = ThreadPoolExecutor(max_workers=1)
+    broker_fut = warm_ex.submit(_warm_broker)
+    warm_ex.shutdown(wait=False)
 
     # 1) 자동 스크리닝으로 심볼 리스트 뽑기
     symbols = screen_top_by_volume_volatility(
@@ -40,79 +197,97 @@ def run_paper_trading_auto_universe() -> None:
         top_n=20,
         min_price=5_000.0,
         min_avg_volume=50_000.0,
+        # 마지막 봉이 오래된(거래정지/상폐 등) 심볼은 스크리너 단계에서 제외
+        max_stale_days=10,
     )
 
     if not symbols:
         msg = "[runner] 스크리너에서 선택된 심볼이 없습니다. 종료합니다."
-        print(msg)
+        logger.info(msg)
         if notifier:
             notifier.send(msg)
+        # 백그라운드 브로커 준비는 취소, 이미 돌고 있으면 끝까지 기다려 예외만 남긴다
+        if not broker_fut.cancel():
+            exc = broker_fut.exception()
+            if exc is not None:
+                logger.warning(f"[runner] 브로커 생성 실패: {exc}")
         return
 
-    # 2) setting.yaml에 따른 브로커 생성 (paper / korea_invest_virtual ...)
-    broker = make_broker()
+    # 2) setting.yaml에 따른 브로커 (paper / korea_invest_virtual ...), 위에서 미리 생성해 둔 것
+    broker = broker_fut.result()
     strategy = HSMSStrategy()
 
     start_msg = "=== LIVE/PAPER Trading (Auto Universe) Start ==="
-    print(start_msg)
+    logger.info(start_msg)
     if notifier:
         notifier.send(start_msg)
 
     try:
-        cash0 = broker.get_cash()
-        print(f"초기 현금: {cash0:,.0f}원\n")
+        # 현금/보유 수량은 루프 진입 전에 한 번만 조회 (종목마다 잔고 조회 RPC 방지)
+        cash0, positions = broker.get_cash_and_positions()
+        positions = positions or {}
+        logger.info(f"초기 현금: {cash0:,.0f}원\n")
         if notifier:
             notifier.send(f"[START] cash={cash0:,.0f} KRW, symbols={len(symbols)}")
     except Exception as e:
-        print(f"[runner] 초기 현금 조회 실패: {e}")
+        logger.warning(f"[runner] 초기 현금/잔고 조회 실패: {e}")
         if notifier:
-            notifier.send(f"[ERROR] 초기 현금 조회 실패: {e}")
+            notifier.send(f"[ERROR] 초기 현금/잔고 조회 실패: {e}")
         return
 
-    for symbol in symbols:
-        try:
-            print(f"[{symbol}] 종목 처리 중...")
+    # 데이터 로드 + 신호 계산: 유니버스를 한 프레임으로 묶어 한 번에 (순서는 스크리너 순서 유지)
+    # 배치 계산이 실패하면 심볼별 병렬 경로로 (심볼별 에러를 따로 기록)
+    try:
+        prepared = _prepare_universe(strategy, symbols)
+    except Exception as e:
+        logger.warning(f"[runner] 배치 신호 계산 실패 -> 심볼별 계산: {e}")
+        with ThreadPoolExecutor(max_workers=min(16, len(symbols))) as ex:
+            prepared = list(ex.map(partial(_prepare_symbol, strategy), symbols))
+
+    # 주문(현금/포지션 상태 변경)은 메인 스레드에서 순차 처리
+    # 현금은 브로커에 다시 묻지 않고 체결 성공분만큼 로컬에서 갱신
+    cash = float(cash0)
+    for symbol, row, err in prepared:
+        if err is not None:
+            logger.warning(f"[runner][SKIP] symbol={symbol} err={err}")
+            if notifier:
+                notifier.send(f"[SKIP] {symbol} err={err}")
+            continue
 
-            df = load_symbol_ohlcv_with_foreign(symbol)
-            if df is None or df.empty:
-                print("  -> 데이터 없음, 스킵")
+        # 종목 하나의 출력은 모아서 logger 호출 한 번으로 (줄마다 큐/IO 왕복 X)
+        lines = [f"[{symbol}] 종목 처리 중..."]
+        try:
+            if row is None:
+                lines.append("  -> 데이터 없음, 스킵")
                 continue
 
-            sig = strategy.generate_signals(df)
-            last = sig.iloc[-1]
-            # loader가 date index면 그대로, 아니면 date 컬럼 처리 필요할 수 있음
-            last_date = sig.index[-1] if hasattr(sig.index, "__len__") else None
-
-            price = float(last["close"])
-            pos_qty = int(broker.get_position(symbol) or 0)
+            last_date, price, buy_signal, sell_signal = row
+            pos_qty = int(positions.get(symbol, 0))
             has_pos = pos_qty > 0
 
-            buy_signal = bool(last.get("buy_signal", False))
-            sell_signal = bool(last.get("sell_signal", False))
-
             if last_date is not None:
-                print(f"  날짜: {getattr(last_date, 'date', lambda: last_date)()}, 종가: {price:,.2f}")
+                lines.append(f"  날짜: {getattr(last_date, 'date', lambda: last_date)()}, 종가: {price:,.2f}")
             else:
-                print(f"  종가: {price:,.2f}")
+                lines.append(f"  종가: {price:,.2f}")
 
-            print(f"  buy_signal={buy_signal}, sell_signal={sell_signal}, 보유수량={pos_qty}")
+            lines.append(f"  buy_signal={buy_signal}, sell_signal={sell_signal}, 보유수량={pos_qty}")
 
             # ---- 매수 ----
             if (not has_pos) and buy_signal:
-                cash = float(broker.get_cash())
                 qty = int(calc_position_size_by_ratio(cash, price, ratio=0.1))
 
                 if qty <= 0:
-                    print("  -> 매수 수량 0 (현금 부족 또는 가격 이상)")
+                    lines.append("  -> 매수 수량 0 (현금 부족 또는 가격 이상)")
                     continue
 
                 # OrderRequest 필드명이 (quantity)인지 (qty)인지 프로젝트에 따라 다를 수 있음.
                 # 여기선 quantity를 쓰되, base.py가 qty를 쓰면 아래 한 줄만 바꾸면 됨.
                 req = OrderRequest(symbol=symbol, side="BUY", quantity=qty, price=price)
                 res = broker.place_order(req)
+                if getattr(res, "success", False):
+                    cash -= qty * price
 
-                msg = f"  -> BUY {qty} @ {price:,.2f}, success={getattr(res, 'success', None)}, msg={getattr(res, 'message', '')}"
-                print(msg)
+                lines.append(f"  -> BUY {qty} @ {price:,.2f}, success={getattr(res, 'success', None)}, msg={getattr(res, 'message', '')}")
                 if notifier:
                     notifier.send(f"[BUY] {symbol} qty={qty} price={price:,.2f} success={getattr(res, 'success', None)}")
 
@@ -120,34 +295,36 @@ def run_paper_trading_auto_universe() -> None:
             elif has_pos and sell_signal:
                 req = OrderRequest(symbol=symbol, side="SELL", quantity=pos_qty, price=price)
                 res = broker.place_order(req)
+                if getattr(res, "success", False):
+                    cash += pos_qty * price
 
-                msg = f"  -> SELL {pos_qty} @ {price:,.2f}, success={getattr(res, 'success', None)}, msg={getattr(res, 'message', '')}"
-                print(msg)
+                lines.append(f"  -> SELL {pos_qty} @ {price:,.2f}, success={getattr(res, 'success', None)}, msg={getattr(res, 'message', '')}")
                 if notifier:
                     notifier.send(f"[SELL] {symbol} qty={pos_qty} price={price:,.2f} success={getattr(res, 'success', None)}")
 
             else:
-                print("  -> 아무 행동도 하지 않음")
+                lines.append("  -> 아무 행동도 하지 않음")
 
-            print()
+            lines.append("")
 
         except Exception as e:
-            print(f"[runner][SKIP] symbol={symbol} err={e}")
+            lines.append(f"[runner][SKIP] symbol={symbol} err={e}")
             if notifier:
                 notifier.send(f"[SKIP] {symbol} err={e}")
+        finally:
+            logger.info("\n".join(lines))
 
     # 종료 요약
     try:
-        cash1 = broker.get_cash()
-        pos = broker.get_positions()
+        cash1, pos = broker.get_cash_and_positions()
         end_msg = "=== LIVE/PAPER Trading (Auto Universe) End ==="
-        print(end_msg)
-        print(f"최종 현금: {cash1:,.0f}원")
-        print(f"최종 포지션: {pos}")
+        logger.info(end_msg)
+        logger.info(f"최종 현금: {cash1:,.0f}원")
+        logger.info(f"최종 포지션: {pos}")
         if notifier:
             notifier.send(f"[END] cash={cash1:,.0f} KRW positions={len(pos)}")
     except Exception as e:
-        print(f"[runner] 종료 요약 조회 실패: {e}")
+        logger.warning(f"[runner] 종료 요약 조회 실패: {e}")
         if notifier:
             notifier.send(f"[ERROR] 종료 요약 조회 실패: {e}")
 
@@ -158,20 +335,23 @@ def run_paper_trading_auto_universe() -> None:
 
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 import pandas as pd
 
 from khms_trader.config import load_settings
 from khms_trader.broker.factory import make_broker
 from khms_trader.broker.base import OrderRequest
-from khms_trader.utils.time_utils import is_trading_day
+from khms_trader.utils.time_utils import is_trading_day, next_trading_day
 from khms_trader.data.universe_kosdaq import get_kosdaq_universe_df
 from khms_trader.data.loader import load_symbol_ohlcv_with_foreign
 from khms_trader.strategies.hsms import HSMS2Strategy
+from khms_trader.utils.json_utils import json_dumps_bytes, json_loads
 
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 PLANS_DIR = PROJECT_ROOT / "plans"
@@ -198,20 +378,17 @@ def _plan_path_for_trading_day(yyyymmdd: str) -> Path:
 
 
 def _next_trading_day_yyyymmdd() -> str:
-    # 주말/공휴일 스킵해서 다음 거래일 찾기
-    dt = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    while True:
-        dt = dt + pd.Timedelta(days=1)
-        if is_trading_day(dt):
-            return dt.strftime("%Y%m%d")
+    # 주말/공휴일 스킵해서 다음 거래일 찾기 (월별 거래일 집합 조회)
+    return next_trading_day().strftime("%Y%m%d")
 
 # -----------------------------
 # Telegram
 # -----------------------------
+@lru_cache(maxsize=1)
 def _tg() -> TelegramNotifier:
     """
     TelegramNotifier는 내부에서 load_settings()를 사용하므로
-    runner에서는 그냥 생성해서 쓰면 됨.
+    runner에서는 그냥 생성해서 쓰면 됨. (프로세스당 한 번만 생성)
     """
     return TelegramNotifier()
 
@@ -239,11 +416,52 @@ def _write_event(event: Dict[str, Any]) -> None:
         event = dict(event)
         event.setdefault("ts", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         EVENTS_PATH.parent.mkdir(parents=True, exist_ok=True)
-        with open(EVENTS_PATH, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        # orjson 사용 가능 시 C 직렬화 (JSONL 형식은 동일, UTF-8 그대로)
+        with open(EVENTS_PATH, "ab") as f:
+            f.write(json_dumps_bytes(event) + b"\n")
     except Exception:
         pass
 
+
+class _EventLogger:
+    """
+    _write_event의 파일 핸들 유지 버전.
+    prepare/execute 한 번 실행 동안 파일을 한 번만 열고(64KB 버퍼) 종료 시 flush.
+    실패해도 매매 엔진을 죽이지 않음.
+    """
+
+    def __init__(self, path: Path = EVENTS_PATH) -> None:
+        self._path = path
+        self._f = None
+
+    def __enter__(self) -> "_EventLogger":
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self._path, "ab", buffering=1 << 16)
+        except Exception:
+            self._f = None
+        return self
+
+    def write(self, event: Dict[str, Any]) -> None:
+        if self._f is None:
+            # 파일을 못 열었으면 호출마다 여는 기본 경로로
+            _write_event(event)
+            return
+        try:
+            event = dict(event)
+            event.setdefault("ts", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            self._f.write(json_dumps_bytes(event) + b"\n")
+        except Exception:
+            pass
+
+    def __exit__(self, *exc) -> None:
+        if self._f is not None:
+            try:
+                self._f.close()
+            except Exception:
+                pass
+            self._f = None
+
 # -----------------------------
 # Universe
 # -----------------------------
@@ -253,17 +471,17 @@ def ensure_today_universe() -> Optional[Path]:
     없으면 생성한다. (주말/공휴일은 None)
     """
     if not is_trading_day():
-        print("[UNIVERSE] Today is not a trading day. Skip universe generation.")
+        logger.info("[UNIVERSE] Today is not a trading day. Skip universe generation.")
         return None
 
     upath = _universe_path_for_today()
     upath.parent.mkdir(parents=True, exist_ok=True)
 
     if upath.exists():
-        print(f"[UNIVERSE] Use existing universe: {upath.name}")
+        logger.info(f"[UNIVERSE] Use existing universe: {upath.name}")
         return upath
 
-    print(f"[UNIVERSE] Creating today's universe: {upath.name}")
+    logger.info(f"[UNIVERSE] Creating today's universe: {upath.name}")
     # 네 프로젝트 함수명에 맞춰 연결
     get_kosdaq_universe_df(output_path=upath)
     return upath
@@ -272,7 +490,8 @@ def ensure_today_universe() -> Optional[Path]:
 def _load_symbols_from_universe(path: Path, limit: int) -> List[str]:
     df = pd.read_csv(path)
     col = "code" if "code" in df.columns else df.columns[0]
-    return [str(x).zfill(6) for x in df[col].dropna().astype(str).tolist()][:limit]
+    # limit개만 잘라서 pandas 문자열 연산으로 zfill (파이썬 루프/전체 리스트 생성 없음)
+    return df[col].dropna().head(limit).astype(str).str.zfill(6).tolist()
 
 
 # -----------------------------
@@ -284,100 +503,157 @@ class NextOpenConfig:
     qty: int = 1
     # 주문 후 체결 확인(짧게)
     poll_seconds: int = 15
-    poll_interval: float = 3.0
+    poll_interval: float = 3.0  # 폴링 간격 상한 (0.3s부터 지수 증가)
 
 
-def prepare_next_open_plan(cfg: NextOpenConfig) -> Optional[Path]:
+def _poll_fills(
+    broker: Any,
+    pending: List[tuple[str, str, str]],
+    cfg: NextOpenConfig,
+    events: _EventLogger,
+) -> None:
     """
-    [15:40 실행 권장]
-    - 전일(오늘) close 기준으로 HSMS2 신호 생성
-    - 내일(다음 거래일) open에 실행할 plan 저장
-
-    Plan에는 BUY 후보와 SELL 후보를 저장하되,
-    실행 시점에 보유여부/중복 등을 한 번 더 필터링한다.
+    제출한 주문들의 체결을 한 루프에서 확인 (최종 체결만 FILL_DONE 기록).
+    - 아직 미체결인 주문만 다시 조회
+    - 조회 간격은 0.3s부터 2배씩 늘려 cfg.poll_interval에서 멈춤 (빠른 체결은 빨리 끝남)
+    - 전체 대기는 cfg.poll_seconds까지
     """
-    _write_event({"type": "PLAN_START", "mode": "next_open", "universe_limit": cfg.universe_limit})
+    if not pending or not hasattr(broker, "get_order_status"):
+        return
 
-    try:
-        if not is_trading_day():
-            print("[PLAN] not trading day -> skip")
-            _write_event({"type": "PLAN_SKIP", "mode": "next_open", "reason": "not_trading_day"})
-            return None
+    deadline = time.time() + cfg.poll_seconds
+    delay = 0.3
+    while pending:
+        still: List[tuple[str, str, str]] = []
+        for side, sym, order_id in pending:
+            st = broker.get_order_status(order_id)
+            if isinstance(st, dict) and st.get("found"):
+                ord_qty = st.get("ord_qty")
+                filled = st.get("filled_qty")
+                avg_price = (st.get("record") or {}).get("avg_prvs")
+                if filled is not None and ord_qty is not None and filled >= ord_qty:
+                    events.write({
+                        "type": "FILL_DONE",
+                        "mode": "next_open",
+                        "side": side,
+                        "symbol": sym,
+                        "order_id": order_id,
+                        "filled": int(filled),
+                        "ord_qty": int(ord_qty),
+                        "avg_price": avg_price,
+                    })
+                    continue
+            still.append((side, sym, order_id))
 
-        upath = ensure_today_universe()
-        if upath is None:
-            print("[PLAN] universe missing -> skip")
-            _write_event({"type": "PLAN_SKIP", "mode": "next_open", "reason": "universe_missing"})
-            return None
+        pending = still
+        remaining = deadline - time.time()
+        if not pending or remaining <= 0:
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, cfg.poll_interval)
 
-        _write_event({"type": "PLAN_UNIVERSE", "mode": "next_open", "universe_file": upath.name})
 
-        symbols = _load_symbols_from_universe(upath, limit=cfg.universe_limit)
-        _write_event({"type": "PLAN_SYMBOLS", "mode": "next_open", "symbols_count": len(symbols)})
+def _eval_symbol(strat: HSMS2Strategy, sym: str) -> Tuple[str, bool, bool, Optional[str]]:
+    """
+    심볼 하나의 마지막 봉 신호 계산: (symbol, buy, sell, error)
+    데이터가 없으면 (sym, False, False, None).
+    """
+    try:
+        df = load_symbol_ohlcv_with_foreign(sym)
+        if df is None or df.empty:
+            return sym, False, False, None
 
-        strat = HSMS2Strategy()
+        last = _last_signal_row(strat, sym, df)
+        return sym, bool(last.get("buy_signal", False)), bool(last.get("sell_signal", False)), None
 
-        buy_list: List[str] = []
-        sell_list: List[str] = []
-        errors: Dict[str, str] = {}
+    except Exception as e:
+        return sym, False, False, str(e)
 
-        for sym in symbols:
-            try:
-                df = load_symbol_ohlcv_with_foreign(sym)
-                if df is None or df.empty:
-                    continue
 
-                sig_df = strat.generate_signals(df)
-                if sig_df is None or sig_df.empty:
-                    continue
+def prepare_next_open_plan(cfg: NextOpenConfig) -> Optional[Path]:
+    """
+    [15:40 실행 권장]
+    - 전일(오늘) close 기준으로 HSMS2 신호 생성
+    - 내일(다음 거래일) open에 실행할 plan 저장
 
-                last = sig_df.iloc[-1]
-                if bool(last.get("buy_signal", False)):
-                    buy_list.append(sym)
-                if bool(last.get("sell_signal", False)):
-                    sell_list.append(sym)
-
-            except Exception as e:
-                errors[sym] = str(e)
-
-        next_day = _next_trading_day_yyyymmdd()
-        plan_path = _plan_path_for_trading_day(next_day)
-
-        plan = {
-            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "fill_mode": "next_open",
-            "for_trading_day": next_day,
-            "universe_file": upath.name,
-            "buy": buy_list,
-            "sell": sell_list,
-            "errors": errors,
-        }
-        plan_path.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
-
-        print(f"[PLAN] saved {plan_path.name} | buy={len(buy_list)} sell={len(sell_list)} err={len(errors)}")
-
-        _write_event({
-            "type": "PLAN_DONE",
-            "mode": "next_open",
-            "for_trading_day": next_day,
-            "universe_file": upath.name,
-            "plan_file": plan_path.name,
-            "buy_count": len(buy_list),
-            "sell_count": len(sell_list),
-            "error_count": len(errors),
-        })
+    Plan에는 BUY 후보와 SELL 후보를 저장하되,
+    실행 시점에 보유여부/중복 등을 한 번 더 필터링한다.
+    """
+    with _EventLogger() as events:
+        events.write({"type": "PLAN_START", "mode": "next_open", "universe_limit": cfg.universe_limit})
+
+        try:
+            if not is_trading_day():
+                logger.info("[PLAN] not trading day -> skip")
+                events.write({"type": "PLAN_SKIP", "mode": "next_open", "reason": "not_trading_day"})
+                return None
+
+            upath = ensure_today_universe()
+            if upath is None:
+                logger.info("[PLAN] universe missing -> skip")
+                events.write({"type": "PLAN_SKIP", "mode": "next_open", "reason": "universe_missing"})
+                return None
+
+            events.write({"type": "PLAN_UNIVERSE", "mode": "next_open", "universe_file": upath.name})
+
+            symbols = _load_symbols_from_universe(upath, limit=cfg.universe_limit)
+            events.write({"type": "PLAN_SYMBOLS", "mode": "next_open", "symbols_count": len(symbols)})
+
+            strat = HSMS2Strategy()
+
+            buy_list: List[str] = []
+            sell_list: List[str] = []
+            errors: Dict[str, str] = {}
+
+            # 심볼별 로드 + 신호 계산은 독립적 -> 스레드 풀 (map은 입력 순서 유지 -> 결과 순서 결정적)
+            with ThreadPoolExecutor(max_workers=16) as ex:
+                for sym, buy, sell, err in ex.map(partial(_eval_symbol, strat), symbols):
+                    if err is not None:
+                        errors[sym] = err
+                        continue
+                    if buy:
+                        buy_list.append(sym)
+                    if sell:
+                        sell_list.append(sym)
+
+            next_day = _next_trading_day_yyyymmdd()
+            plan_path = _plan_path_for_trading_day(next_day)
+
+            plan = {
+                "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "fill_mode": "next_open",
+                "for_trading_day": next_day,
+                "universe_file": upath.name,
+                "buy": buy_list,
+                "sell": sell_list,
+                "errors": errors,
+            }
+            plan_path.write_text(json.dumps(plan, ensure_ascii=False, indent=2), encoding="utf-8")
+
+            logger.info(f"[PLAN] saved {plan_path.name} | buy={len(buy_list)} sell={len(sell_list)} err={len(errors)}")
+
+            events.write({
+                "type": "PLAN_DONE",
+                "mode": "next_open",
+                "for_trading_day": next_day,
+                "universe_file": upath.name,
+                "plan_file": plan_path.name,
+                "buy_count": len(buy_list),
+                "sell_count": len(sell_list),
+                "error_count": len(errors),
+            })
 
-        if errors:
-            # 너무 길어질 수 있어 샘플만 남김
-            top3 = list(errors.items())[:3]
-            sample = " | ".join([f"{s}:{m[:60]}" for s, m in top3])
-            _write_event({"type": "PLAN_WARN", "mode": "next_open", "error_count": len(errors), "sample": sample})
+            if errors:
+                # 너무 길어질 수 있어 샘플만 남김
+                top3 = list(errors.items())[:3]
+                sample = " | ".join([f"{s}:{m[:60]}" for s, m in top3])
+                events.write({"type": "PLAN_WARN", "mode": "next_open", "error_count": len(errors), "sample": sample})
 
-        return plan_path
+            return plan_path
 
-    except Exception as e:
-        _write_event({"type": "ERROR", "stage": "PLAN", "mode": "next_open", "error": f"{type(e).__name__}: {e}"})
-        raise
+        except Exception as e:
+            events.write({"type": "ERROR", "stage": "PLAN", "mode": "next_open", "error": f"{type(e).__name__}: {e}"})
+            raise
 
 
 
@@ -387,192 +663,160 @@ def execute_next_open_plan(cfg: NextOpenConfig, dry_run: bool = False) -> None:
     - 오늘자 plan 파일을 읽어 open에 BUY/SELL 집행
     - 실제 집행 전에 보유 여부/중복 매수 등을 브로커 포지션으로 필터링
     """
-    _write_event({
-        "type": "EXEC_START",
-        "mode": "next_open",
-        "dry_run": dry_run,
-        "qty": cfg.qty,
-    })
+    with _EventLogger() as events:
+        events.write({
+            "type": "EXEC_START",
+            "mode": "next_open",
+            "dry_run": dry_run,
+            "qty": cfg.qty,
+        })
 
-    try:
-        if not is_trading_day():
-            print("[EXEC] not trading day -> skip")
-            _write_event({"type": "EXEC_SKIP", "mode": "next_open", "reason": "not_trading_day"})
-            return
+        try:
+            if not is_trading_day():
+                logger.info("[EXEC] not trading day -> skip")
+                events.write({"type": "EXEC_SKIP", "mode": "next_open", "reason": "not_trading_day"})
+                return
+
+            today = _today_yyyymmdd()
+            plan_path = _plan_path_for_trading_day(today)
+            if not plan_path.exists():
+                logger.info(f"[EXEC] plan not found: {plan_path.name}")
+                events.write({
+                    "type": "EXEC_SKIP",
+                    "mode": "next_open",
+                    "reason": "plan_missing",
+                    "plan_file": plan_path.name,
+                })
+                return
+
+            plan = json_loads(plan_path.read_bytes())
+            buy_list = [str(x).zfill(6) for x in (plan.get("buy") or [])]
+            sell_list = [str(x).zfill(6) for x in (plan.get("sell") or [])]
+
+            broker = make_broker()
+            positions: Dict[str, int] = broker.get_positions() if hasattr(broker, "get_positions") else {}
 
-        today = _today_yyyymmdd()
-        plan_path = _plan_path_for_trading_day(today)
-        if not plan_path.exists():
-            print(f"[EXEC] plan not found: {plan_path.name}")
-            _write_event({
-                "type": "EXEC_SKIP",
+            events.write({
+                "type": "EXEC_PLAN",
                 "mode": "next_open",
-                "reason": "plan_missing",
                 "plan_file": plan_path.name,
+                "buy_count": len(buy_list),
+                "sell_count": len(sell_list),
+                "positions_count": len(positions),
             })
-            return
 
-        plan = json.loads(plan_path.read_text(encoding="utf-8"))
-        buy_list = [str(x).zfill(6) for x in (plan.get("buy") or [])]
-        sell_list = [str(x).zfill(6) for x in (plan.get("sell") or [])]
+            # ----------------
+            # SELL
+            # ----------------
+            pending: List[tuple[str, str, str]] = []  # (side, symbol, order_id)
+            for sym in sell_list:
+                held = int(positions.get(sym, 0))
+                if held <= 0:
+                    continue
 
-        broker = make_broker()
-        positions: Dict[str, int] = broker.get_positions() if hasattr(broker, "get_positions") else {}
+                if dry_run:
+                    logger.info(f"[DRYRUN][SELL] {sym} qty={held}")
+                    events.write({
+                        "type": "ORDER_SUBMIT",
+                        "mode": "next_open",
+                        "side": "SELL",
+                        "symbol": sym,
+                        "qty": held,
+                        "dry_run": True,
+                    })
+                    continue
 
-        _write_event({
-            "type": "EXEC_PLAN",
-            "mode": "next_open",
-            "plan_file": plan_path.name,
-            "buy_count": len(buy_list),
-            "sell_count": len(sell_list),
-            "positions_count": len(positions),
-        })
+                req = OrderRequest(symbol=sym, side="SELL", quantity=held, price=None)
+                res = broker.place_order(req)
+                order_id = getattr(res, "order_id", None) or getattr(res, "order_no", None)
+                msg = getattr(res, "message", "") or getattr(res, "msg", "")
 
-        # ----------------
-        # SELL
-        # ----------------
-        for sym in sell_list:
-            held = int(positions.get(sym, 0))
-            if held <= 0:
-                continue
+                logger.info(f"[SELL] {sym} qty={held} order_id={order_id} msg={msg}")
 
-            if dry_run:
-                print(f"[DRYRUN][SELL] {sym} qty={held}")
-                _write_event({
+                events.write({
                     "type": "ORDER_SUBMIT",
                     "mode": "next_open",
                     "side": "SELL",
                     "symbol": sym,
                     "qty": held,
-                    "dry_run": True,
+                    "order_id": str(order_id) if order_id else None,
+                    "message": msg,
+                    "dry_run": False,
                 })
-                continue
 
-            req = OrderRequest(symbol=sym, side="SELL", quantity=held, price=None)
-            res = broker.place_order(req)
-            order_id = getattr(res, "order_id", None) or getattr(res, "order_no", None)
-            msg = getattr(res, "message", "") or getattr(res, "msg", "")
+                if order_id:
+                    pending.append(("SELL", sym, str(order_id)))
 
-            print(f"[SELL] {sym} qty={held} order_id={order_id} msg={msg}")
+            # 매도 체결을 먼저 확인한 뒤 매수 (현금 확보 순서 유지)
+            _poll_fills(broker, pending, cfg, events)
 
-            _write_event({
-                "type": "ORDER_SUBMIT",
-                "mode": "next_open",
-                "side": "SELL",
-                "symbol": sym,
-                "qty": held,
-                "order_id": str(order_id) if order_id else None,
-                "message": msg,
-                "dry_run": False,
-            })
+            # ----------------
+            # BUY
+            # ----------------
+            pending = []
+            for sym in buy_list:
+                held = int(positions.get(sym, 0))
+                if held > 0:
+                    continue
 
-            # 체결 폴링 (최종 체결만 기록)
-            if order_id and hasattr(broker, "get_order_status"):
-                deadline = time.time() + cfg.poll_seconds
-                while time.time() < deadline:
-                    st = broker.get_order_status(str(order_id))
-                    if isinstance(st, dict) and st.get("found"):
-                        ord_qty = st.get("ord_qty")
-                        filled = st.get("filled_qty")
-                        avg_price = (st.get("record") or {}).get("avg_prvs")
-                        if filled is not None and ord_qty is not None and filled >= ord_qty:
-                            _write_event({
-                                "type": "FILL_DONE",
-                                "mode": "next_open",
-                                "side": "SELL",
-                                "symbol": sym,
-                                "order_id": str(order_id),
-                                "filled": int(filled),
-                                "ord_qty": int(ord_qty),
-                                "avg_price": avg_price,
-                            })
-                            break
-                    time.sleep(cfg.poll_interval)
-
-        # ----------------
-        # BUY
-        # ----------------
-        for sym in buy_list:
-            held = int(positions.get(sym, 0))
-            if held > 0:
-                continue
+                if dry_run:
+                    logger.info(f"[DRYRUN][BUY] {sym} qty={cfg.qty}")
+                    events.write({
+                        "type": "ORDER_SUBMIT",
+                        "mode": "next_open",
+                        "side": "BUY",
+                        "symbol": sym,
+                        "qty": cfg.qty,
+                        "dry_run": True,
+                    })
+                    continue
+
+                req = OrderRequest(symbol=sym, side="BUY", quantity=cfg.qty, price=None)
+                res = broker.place_order(req)
+                order_id = getattr(res, "order_id", None) or getattr(res, "order_no", None)
+                msg = getattr(res, "message", "") or getattr(res, "msg", "")
 
-            if dry_run:
-                print(f"[DRYRUN][BUY] {sym} qty={cfg.qty}")
-                _write_event({
+                logger.info(f"[BUY] {sym} qty={cfg.qty} order_id={order_id} msg={msg}")
+
+                events.write({
                     "type": "ORDER_SUBMIT",
                     "mode": "next_open",
                     "side": "BUY",
                     "symbol": sym,
                     "qty": cfg.qty,
-                    "dry_run": True,
+                    "order_id": str(order_id) if order_id else None,
+                    "message": msg,
+                    "dry_run": False,
                 })
-                continue
 
-            req = OrderRequest(symbol=sym, side="BUY", quantity=cfg.qty, price=None)
-            res = broker.place_order(req)
-            order_id = getattr(res, "order_id", None) or getattr(res, "order_no", None)
-            msg = getattr(res, "message", "") or getattr(res, "msg", "")
+                if order_id:
+                    pending.append(("BUY", sym, str(order_id)))
 
-            print(f"[BUY] {sym} qty={cfg.qty} order_id={order_id} msg={msg}")
+            _poll_fills(broker, pending, cfg, events)
 
-            _write_event({
-                "type": "ORDER_SUBMIT",
-                "mode": "next_open",
-                "side": "BUY",
-                "symbol": sym,
-                "qty": cfg.qty,
-                "order_id": str(order_id) if order_id else None,
-                "message": msg,
-                "dry_run": False,
-            })
+            # 종료 요약
+            try:
+                cash, pos = broker.get_cash_and_positions()
+                events.write({
+                    "type": "EXEC_DONE",
+                    "mode": "next_open",
+                    "dry_run": dry_run,
+                    "cash": cash,
+                    "positions_count": len(pos),
+                })
+            except Exception:
+                events.write({
+                    "type": "EXEC_DONE",
+                    "mode": "next_open",
+                    "dry_run": dry_run,
+                    "summary": "partial",
+                })
 
-            if order_id and hasattr(broker, "get_order_status"):
-                deadline = time.time() + cfg.poll_seconds
-                while time.time() < deadline:
-                    st = broker.get_order_status(str(order_id))
-                    if isinstance(st, dict) and st.get("found"):
-                        ord_qty = st.get("ord_qty")
-                        filled = st.get("filled_qty")
-                        avg_price = (st.get("record") or {}).get("avg_prvs")
-                        if filled is not None and ord_qty is not None and filled >= ord_qty:
-                            _write_event({
-                                "type": "FILL_DONE",
-                                "mode": "next_open",
-                                "side": "BUY",
-                                "symbol": sym,
-                                "order_id": str(order_id),
-                                "filled": int(filled),
-                                "ord_qty": int(ord_qty),
-                                "avg_price": avg_price,
-                            })
-                            break
-                    time.sleep(cfg.poll_interval)
-
-        # 종료 요약
-        try:
-            cash = broker.get_cash()
-            pos = broker.get_positions() if hasattr(broker, "get_positions") else {}
-            _write_event({
-                "type": "EXEC_DONE",
-                "mode": "next_open",
-                "dry_run": dry_run,
-                "cash": cash,
-                "positions_count": len(pos),
-            })
-        except Exception:
-            _write_event({
-                "type": "EXEC_DONE",
+        except Exception as e:
+            events.write({
+                "type": "ERROR",
+                "stage": "EXEC",
                 "mode": "next_open",
-                "dry_run": dry_run,
-                "summary": "partial",
+                "error": f"{type(e).__name__}: {e}",
             })
-
-    except Exception as e:
-        _write_event({
-            "type": "ERROR",
-            "stage": "EXEC",
-            "mode": "next_open",
-            "error": f"{type(e).__name__}: {e}",
-        })
-        raise
+            raise
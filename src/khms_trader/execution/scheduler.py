@@ -1,12 +1,19 @@
 # src/khms_trader/execution/scheduler.py
 from __future__ import annotations
 
+import atexit
 import os
+import signal
+from bisect import bisect_right
+import threading
 import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, tzinfo
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Optional, List, Tuple
+from typing import Callable, Optional, List, Sequence, Tuple
+
+from khms_trader.utils.logging_utils import get_logger
 
 try:
     # Python 3.9+ (3.11 OK)
@@ -14,6 +21,11 @@ try:
 except Exception:  # pragma: no cover
     ZoneInfo = None  # type: ignore
 
+try:
+    import fcntl  # POSIX 전용 (flock)
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
 
 # -----------------------------
 # Lock (single instance)
@@ -21,31 +33,92 @@ except Exception:  # pragma: no cover
 class SingleInstanceLock:
     """
     아주 단순한 락: lock 파일을 만들어 중복 실행 방지.
-    비정상 종료 시 lock 파일이 남을 수 있으므로,
-    그 경우 사용자가 lock 파일을 삭제해야 함.
+
+    - 파일 생성은 O_CREAT|O_EXCL로 원자적 (동시에 시작한 두 프로세스 중 하나만 성공)
+    - POSIX에서는 파일에 flock을 잡아 둔다. 프로세스가 죽으면 OS가 flock을 풀어 주므로,
+      다음 실행 때 flock이 비어 있는 lock 파일은 이전 비정상 종료의 잔재로 보고 다시 가져온다.
+    - flock이 없는 환경(Windows)에서는 비정상 종료 시 lock 파일이 남을 수 있으므로,
+      그 경우 사용자가 lock 파일을 삭제해야 함.
     """
 
     def __init__(self, lock_path: Path):
         self.lock_path = lock_path
         self._acquired = False
+        self._fd: Optional[int] = None
+
+    def _lock_exists_error(self) -> RuntimeError:
+        return RuntimeError(
+            f"Lock exists: {self.lock_path}. Another instance may be running, "
+            f"or the previous run crashed. If you are sure no instance is running, "
+            f"delete the lock file."
+        )
 
     def acquire(self) -> None:
         self.lock_path.parent.mkdir(parents=True, exist_ok=True)
-        if self.lock_path.exists():
-            raise RuntimeError(
-                f"Lock exists: {self.lock_path}. Another instance may be running, "
-                f"or the previous run crashed. If you are sure no instance is running, "
-                f"delete the lock file."
-            )
-        self.lock_path.write_text(str(os.getpid()), encoding="utf-8")
+        try:
+            fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            fd = self._reclaim_stale()
+
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                raise self._lock_exists_error() from None
+            # flock을 잡는 사이 이전 보유자가 파일을 지웠다면(다른 inode) 무효
+            try:
+                same = os.fstat(fd).st_ino == os.stat(self.lock_path).st_ino
+            except FileNotFoundError:
+                same = False
+            if not same:
+                os.close(fd)
+                raise self._lock_exists_error()
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("utf-8"))
+        # fd는 release까지 열어 둔다 (flock 유지)
+        self._fd = fd
         self._acquired = True
+        atexit.register(self.release)
+
+    def _reclaim_stale(self) -> int:
+        """
+        기존 lock 파일의 flock이 비어 있으면(보유 프로세스 없음) 그 파일을 다시 쓴다.
+        flock을 못 쓰는 환경이거나 다른 프로세스가 잡고 있으면 RuntimeError.
+        """
+        if fcntl is None:
+            raise self._lock_exists_error()
+        try:
+            fd = os.open(self.lock_path, os.O_WRONLY)
+        except FileNotFoundError:
+            # 그 사이 다른 프로세스가 정상 종료하며 지운 경우 -> 다시 원자적 생성 시도
+            try:
+                return os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                raise self._lock_exists_error() from None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            raise self._lock_exists_error() from None
+        logger.info(f"[{_now_str()}] stale lock reclaimed: {self.lock_path}")
+        return fd
 
     def release(self) -> None:
-        if self._acquired and self.lock_path.exists():
+        if self._acquired:
+            atexit.unregister(self.release)
             try:
+                # 파일을 먼저 지우고 fd를 닫아야 다른 프로세스가 지워질 파일을 잡지 않는다
                 self.lock_path.unlink()
             except Exception:
                 pass
+        if self._fd is not None:
+            try:
+                os.close(self._fd)  # flock도 함께 해제
+            except OSError:
+                pass
+            self._fd = None
         self._acquired = False
 
     def __enter__(self):
@@ -56,10 +129,36 @@ class SingleInstanceLock:
         self.release()
 
 
+logger = get_logger("khms.scheduler")
+
+
 def _now_str() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 
+def _install_sigint(stop: threading.Event):
+    """
+    Ctrl-C(SIGINT) -> stop 이벤트 set (대기 중이면 즉시 깨어나 종료).
+    job 실행 중 한 번 더 누르면 기존처럼 KeyboardInterrupt.
+    메인 스레드가 아니면 설치하지 않고 None 반환.
+    """
+    def _handler(signum, frame) -> None:
+        if stop.is_set():
+            raise KeyboardInterrupt
+        stop.set()
+
+    try:
+        return signal.signal(signal.SIGINT, _handler)
+    except ValueError:
+        # signal은 메인 스레드에서만 설치 가능
+        return None
+
+
+def _restore_sigint(prev) -> None:
+    if prev is not None:
+        signal.signal(signal.SIGINT, prev)
+
+
 # -----------------------------
 # Interval scheduler
 # -----------------------------
@@ -81,49 +180,67 @@ class IntervalScheduler:
         self.job = job
         self.on_error_sleep_sec = on_error_sleep_sec
         self.lock_path = lock_path
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """다른 스레드/시그널 핸들러에서 호출 가능. 대기 중인 루프를 즉시 종료."""
+        self._stop.set()
 
-    def _aligned_next_run(self, now: float) -> float:
+    def _aligned_next_run_ns(self, now_ns: int) -> int:
         """
         벽시계 기준 정렬:
         예) interval=300이면 09:00, 09:05, 09:10 ... 에 맞춰 실행되도록 계산
+        정수 나노초로 계산해 장시간 실행해도 float 오차/드리프트가 없다.
         """
-        interval = float(self.schedule.interval_sec)
-        base = (now // interval) * interval
-        return base + interval
+        interval_ns = int(self.schedule.interval_sec) * 1_000_000_000
+        return (now_ns // interval_ns + 1) * interval_ns
 
     def run_forever(self) -> None:
         lock = SingleInstanceLock(self.lock_path) if self.lock_path else None
 
         def _loop() -> None:
-            print(f"[{_now_str()}] interval-scheduler start | interval={self.schedule.interval_sec}s")
-            next_run = self._aligned_next_run(time.time()) if self.schedule.align_to_interval else time.time()
+            logger.info(f"[{_now_str()}] interval-scheduler start | interval={self.schedule.interval_sec}s")
+            align = self.schedule.align_to_interval
+            interval_ns = int(self.schedule.interval_sec) * 1_000_000_000
+            # 정렬 모드는 벽시계(time_ns), 아니면 시계 변경에 영향 없는 monotonic 기준
+            clock_ns = time.time_ns if align else time.monotonic_ns
+            next_run = self._aligned_next_run_ns(clock_ns()) if align else clock_ns()
 
             while True:
-                now = time.time()
+                now = clock_ns()
                 if now < next_run:
-                    time.sleep(max(0.2, next_run - now))
+                    # 다음 실행 시각까지 한 번에 대기 (stop()/Ctrl-C면 즉시 깨어남)
+                    if self._stop.wait(timeout=(next_run - now) / 1e9):
+                        logger.info(f"\n[{_now_str()}] scheduler stopped")
+                        return
                     continue
 
                 try:
-                    print(f"\n[{_now_str()}] tick")
+                    logger.info(f"\n[{_now_str()}] tick")
                     self.job()
                 except KeyboardInterrupt:
-                    print(f"\n[{_now_str()}] scheduler stopped by user")
+                    logger.info(f"\n[{_now_str()}] scheduler stopped by user")
                     break
                 except Exception as e:
-                    print(f"[{_now_str()}] ERROR in job: {e}")
-                    time.sleep(self.on_error_sleep_sec)
+                    logger.exception(f"[{_now_str()}] ERROR in job: {e}")
+                    self._stop.wait(timeout=self.on_error_sleep_sec)
 
-                if self.schedule.align_to_interval:
-                    next_run = self._aligned_next_run(time.time())
+                if align:
+                    next_run = self._aligned_next_run_ns(clock_ns())
                 else:
-                    next_run += self.schedule.interval_sec
-
-        if lock:
-            with lock:
+                    # 고정 주기: job 실행 시간만큼 다음 대기가 줄어든다 (드리프트 없음)
+                    next_run += interval_ns
+
+        self._stop.clear()
+        prev = _install_sigint(self._stop)
+        try:
+            if lock:
+                with lock:
+                    _loop()
+            else:
                 _loop()
-        else:
-            _loop()
+        finally:
+            _restore_sigint(prev)
 
 
 # -----------------------------
@@ -146,26 +263,26 @@ def _parse_hhmm(hhmm: str) -> Tuple[int, int]:
     return hh, mm
 
 
-def _tz_now(tz_name: str) -> datetime:
-    if ZoneInfo is None:
-        # fallback: 로컬 시간
-        return datetime.now()
-    return datetime.now(ZoneInfo(tz_name))
+@lru_cache(maxsize=8)
+def _zi(tz_name: str) -> Optional[tzinfo]:
+    """tz 객체는 이름별로 한 번만 만든다. (zoneinfo가 없으면 None -> 로컬 시간)"""
+    return ZoneInfo(tz_name) if ZoneInfo is not None else None
 
 
-def _next_run_dt(times_hhmm: List[str], tz_name: str) -> datetime:
+def _next_run_dt(times: Sequence[Tuple[int, int]], tz_name: str) -> datetime:
     """
     tz 기준으로, 다음 실행 시각(datetime)을 계산
+    times: 미리 파싱해 정렬해 둔 (hh, mm) 목록 -> 후보 루프 없이 이진 탐색 한 번
     """
-    now = _tz_now(tz_name)
-    candidates: List[datetime] = []
-    for t in times_hhmm:
-        hh, mm = _parse_hhmm(t)
-        dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
-        if dt <= now:
-            dt = dt + timedelta(days=1)
-        candidates.append(dt)
-    return min(candidates)
+    now = datetime.now(_zi(tz_name))
+    # (hh, mm) < (hh, mm, ss, us) 이므로 정각과 같은 시각(dt <= now)도 '지난 것'으로 처리된다.
+    i = bisect_right(times, (now.hour, now.minute, now.second, now.microsecond))
+    if i < len(times):
+        hh, mm = times[i]
+        return now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+    # 오늘 남은 시각이 없으면 내일 첫 시각
+    hh, mm = times[0]
+    return now.replace(hour=hh, minute=mm, second=0, microsecond=0) + timedelta(days=1)
 
 
 class TimeOfDayScheduler:
@@ -180,37 +297,54 @@ class TimeOfDayScheduler:
         self.job = job
         self.lock_path = lock_path
         self.on_error_sleep_sec = on_error_sleep_sec
+        self._stop = threading.Event()
+        # "HH:MM" 파싱/정렬은 생성 시 한 번만 (형식 오류도 여기서 바로 드러남)
+        self._times = sorted(set(_parse_hhmm(t) for t in schedule.times_hhmm))
+        if not self._times:
+            raise ValueError("times_hhmm is empty")
+
+    def stop(self) -> None:
+        """다른 스레드/시그널 핸들러에서 호출 가능. 대기 중인 루프를 즉시 종료."""
+        self._stop.set()
 
     def run_forever(self) -> None:
         lock = SingleInstanceLock(self.lock_path) if self.lock_path else None
 
         def _loop() -> None:
             times = self.schedule.times_hhmm
+            hhmm = self._times
             tz = self.schedule.timezone_name
-            print(f"[{_now_str()}] tod-scheduler start | times={times} tz={tz}")
+            logger.info(f"[{_now_str()}] tod-scheduler start | times={times} tz={tz}")
 
             while True:
                 try:
-                    nxt_dt = _next_run_dt(times, tz)
+                    nxt_dt = _next_run_dt(hhmm, tz)
                     # nxt_dt는 tz-aware일 수 있음. epoch 변환은 timestamp() 사용.
                     sleep_sec = max(0.5, nxt_dt.timestamp() - time.time())
-                    time.sleep(sleep_sec)
+                    if self._stop.wait(timeout=sleep_sec):
+                        logger.info(f"\n[{_now_str()}] scheduler stopped")
+                        return
 
                     # “이번에 계산된 nxt_dt” 기준으로 triggered를 결정(오차에 강함)
                     triggered = nxt_dt.strftime("%H:%M")
 
-                    print(f"\n[{_now_str()}] tick@{triggered}")
+                    logger.info(f"\n[{_now_str()}] tick@{triggered}")
                     self.job(triggered)
 
                 except KeyboardInterrupt:
-                    print(f"\n[{_now_str()}] scheduler stopped by user")
+                    logger.info(f"\n[{_now_str()}] scheduler stopped by user")
                     break
                 except Exception as e:
-                    print(f"[{_now_str()}] ERROR in job: {e}")
-                    time.sleep(self.on_error_sleep_sec)
-
-        if lock:
-            with lock:
+                    logger.exception(f"[{_now_str()}] ERROR in job: {e}")
+                    self._stop.wait(timeout=self.on_error_sleep_sec)
+
+        self._stop.clear()
+        prev = _install_sigint(self._stop)
+        try:
+            if lock:
+                with lock:
+                    _loop()
+            else:
                 _loop()
-        else:
-            _loop()
+        finally:
+            _restore_sigint(prev)
@@ -1,6 +1,7 @@
 import argparse
 
 from .execution.runner import run_paper_trading_auto_universe
+from .utils.logging_utils import setup_logging
 
 
 def run_backtest() -> None:
@@ -15,6 +16,7 @@ def run_live() -> None:
     - HSMS 전략 + PaperBroker 모의투자
     를 수행한다.
     """
+    setup_logging()  # logs/khms_trader.log
     print("[khms_trader] LIVE 모드 (PaperBroker + 자동 스크리너) 시작")
     run_paper_trading_auto_universe()
     print("[khms_trader] LIVE 모드 종료")
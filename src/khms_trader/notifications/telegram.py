@@ -1,11 +1,43 @@
 from __future__ import annotations
 
-import requests
-import time
+import atexit
+import queue
+import threading
 from dataclasses import dataclass
+from typing import Any, Optional
 from khms_trader.config import load_settings
 
 
+# 텔레그램 sendMessage 최대 길이 (묶어서 보낼 때 이 길이를 넘기지 않음)
+_MAX_MESSAGE_LEN = 4096
+_BATCH_SEP = "\n---\n"
+
+
+def _make_session() -> Any:
+    """
+    api.telegram.org 커넥션을 keep-alive로 재사용 (메시지마다 TLS 핸드셰이크 X)
+    연결 오류 / 429 / 5xx는 어댑터 레벨에서 백오프(0.5s, 1s, 2s) 재시도
+    requests는 텔레그램이 켜져 있을 때만 import (꺼진 프로세스는 import 비용 없음)
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["POST"]),
+        raise_on_status=False,
+    )
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry),
+    )
+    return session
+
+
 @dataclass(frozen=True)
 class TelegramConfig:
     enabled: bool
@@ -25,30 +57,79 @@ class TelegramNotifier:
         self.base_url = f"https://api.telegram.org/bot{self.cfg.token}/sendMessage"
         print("[DEBUG] telegram enabled/token/chat_id:", self.cfg.enabled, bool(self.cfg.token), self.cfg.chat_id)
 
+        # send()는 큐에 넣고 바로 반환, 실제 전송은 백그라운드 스레드 하나가 담당
+        # (매매 루프가 텔레그램 지연/장애에 묶이지 않도록)
+        self._q: "queue.Queue[Optional[str]]" = queue.Queue(maxsize=256)
+        self._worker: Optional[threading.Thread] = None
+        self._session: Any = None
+        if self.cfg.enabled:
+            self._session = _make_session()
+            self._worker = threading.Thread(target=self._drain, name="telegram-sender", daemon=True)
+            self._worker.start()
+            # 종료 시 남은 메시지 flush
+            atexit.register(self.close)
+
     def send(self, text: str) -> None:
-        if not self.cfg.enabled:
+        if self._worker is None:
             return
+        try:
+            self._q.put_nowait(text)
+        except queue.Full:
+            print(f"[WARN] telegram queue full, message dropped: {text[:80]}")
 
+    def _drain(self) -> None:
+        """큐에 쌓인 메시지를 꺼내 전송. 여러 개가 밀려 있으면 한 메시지로 묶는다. None이면 종료."""
+        pending: Optional[str] = None
+        while True:
+            text = pending if pending is not None else self._q.get()
+            pending = None
+            if text is None:
+                return
+
+            batch = [text]
+            size = len(text)
+            stop = False
+            while True:
+                try:
+                    nxt = self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                if size + len(_BATCH_SEP) + len(nxt) > _MAX_MESSAGE_LEN:
+                    pending = nxt
+                    break
+                batch.append(nxt)
+                size += len(_BATCH_SEP) + len(nxt)
+
+            self._post(_BATCH_SEP.join(batch))
+            if stop:
+                return
+
+    def _post(self, text: str) -> None:
         payload = {
             "chat_id": self.cfg.chat_id,
             "text": text,
             "disable_web_page_preview": True,
         }
 
+        try:
+            r = self._session.post(self.base_url, json=payload, timeout=5)
+            if not r.ok:
+                print(f"[WARN] telegram send failed: status={r.status_code} body={r.text}")
+        except Exception as e:
+            # 전송 스레드가 죽지 않도록 모든 예외를 경고로만 남김
+            print(f"[WARN] telegram send failed: {e}")
 
-        last_err = None
-        for attempt in range(3):
+    def close(self, timeout: float = 10.0) -> None:
+        """남은 메시지 전송을 기다린 뒤(최대 timeout초) 커넥션 풀 정리. 여러 번 호출해도 됨."""
+        worker, self._worker = self._worker, None
+        if worker is not None:
             try:
-                r = self._session.post(self.base_url, json=payload, timeout=5)
-                if not r.ok:
-                    print(f"[WARN] telegram send failed: status={r.status_code} body={r.text}")
-                r.raise_for_status()
-                return
-            except requests.exceptions.RequestException as e:
-                last_err = e
-                # 세션이 꼬였을 수 있으니 재생성
-                self._session.close()
-                self._session = requests.Session()
-                time.sleep(0.5 * (attempt + 1))
-
-        print(f"[WARN] telegram send failed: {last_err}")
\ No newline at end of file
+                self._q.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            worker.join(timeout=timeout)
+        if self._session is not None:
+            self._session.close()
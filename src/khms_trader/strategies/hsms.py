@@ -3,11 +3,188 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
+from khms_trader.utils.jit import njit
+
 from .base import BaseStrategy
 
 
+# NaN 검사(rolling의 min_periods=window 동작)에 의존하므로 fastmath는 사용하지 않는다.
+@njit(cache=True)
+def _rolling_sum(x: np.ndarray, window: int) -> np.ndarray:
+    """
+    rolling(window).sum(): 윈도우가 다 차지 않았거나 NaN이 섞이면 NaN.
+    슬라이딩 누적합(들어온 값 +, 빠지는 값 -)으로 O(n). 보정합(Kahan)으로 오차 누적 방지.
+    """
+    n = x.shape[0]
+    out = np.empty(n)
+    acc = 0.0
+    comp = 0.0
+    nan_cnt = 0  # 윈도우 안 NaN 개수
+    for i in range(n):
+        v = x[i]
+        if np.isnan(v):
+            nan_cnt += 1
+        else:
+            y = v - comp
+            t = acc + y
+            comp = (t - acc) - y
+            acc = t
+        if i >= window:
+            old = x[i - window]
+            if np.isnan(old):
+                nan_cnt -= 1
+            else:
+                y = -old - comp
+                t = acc + y
+                comp = (t - acc) - y
+                acc = t
+        if i < window - 1 or nan_cnt > 0:
+            out[i] = np.nan
+        else:
+            out[i] = acc
+    return out
+
+
+@njit(cache=True)
+def _hsms_core(
+    close: np.ndarray,
+    volume: np.ndarray,
+    foreign: np.ndarray,
+    ma_window: int,
+    momentum_window: int,
+    volume_lookback: int,
+    volume_multiplier: float,
+    foreign_lookback: int,
+    foreign_min_sum: float,
+    use_foreign: bool,
+):
+    """
+    HSMS 1.0 / 2.0 지표와 신호를 한 번에 계산.
+    반환: (ma, momentum, vol_avg, foreign_sum, buy, sell)
+    use_foreign=False면 foreign_sum은 계산하지 않고(NaN) 신호에도 쓰지 않는다.
+    NaN 비교는 항상 False이므로 pandas의 fillna(False)와 결과가 같다.
+    """
+    n = close.shape[0]
+    ma = _rolling_sum(close, ma_window) / ma_window
+    vol_avg = _rolling_sum(volume, volume_lookback) / volume_lookback
+    if use_foreign:
+        foreign_sum = _rolling_sum(foreign, foreign_lookback)
+    else:
+        foreign_sum = np.full(n, np.nan)
+
+    momentum = np.empty(n)
+    buy = np.empty(n, dtype=np.bool_)
+    sell = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        if i >= momentum_window:
+            momentum[i] = close[i] - close[i - momentum_window]
+        else:
+            momentum[i] = np.nan
+
+        b = close[i] > ma[i] and momentum[i] > 0 and volume[i] > vol_avg[i] * volume_multiplier
+        s = close[i] < ma[i] * 0.99 or momentum[i] < 0
+        if use_foreign:
+            b = b and foreign_sum[i] > foreign_min_sum
+            s = s or foreign_sum[i] < 0
+        buy[i] = b
+        sell[i] = s
+    return ma, momentum, vol_avg, foreign_sum, buy, sell
+
+
+@njit(cache=True)
+def _hsms_core_grouped(
+    close: np.ndarray,
+    volume: np.ndarray,
+    foreign: np.ndarray,
+    starts: np.ndarray,
+    ma_window: int,
+    momentum_window: int,
+    volume_lookback: int,
+    volume_multiplier: float,
+    foreign_lookback: int,
+    foreign_min_sum: float,
+    use_foreign: bool,
+):
+    """
+    여러 심볼을 이어 붙인 배열에 _hsms_core를 구간별로 적용. (롤링 윈도우가 심볼 경계를 넘지 않음)
+    starts: 각 심볼 구간의 시작 행 (오름차순, starts[0] == 0). 단일 심볼이면 [0].
+    """
+    n = close.shape[0]
+    ma = np.empty(n)
+    momentum = np.empty(n)
+    vol_avg = np.empty(n)
+    foreign_sum = np.empty(n)
+    buy = np.empty(n, dtype=np.bool_)
+    sell = np.empty(n, dtype=np.bool_)
+    n_groups = starts.shape[0]
+    for g in range(n_groups):
+        lo = starts[g]
+        hi = starts[g + 1] if g + 1 < n_groups else n
+        m, mo, va, fs, b, s = _hsms_core(
+            close[lo:hi],
+            volume[lo:hi],
+            foreign[lo:hi],
+            ma_window,
+            momentum_window,
+            volume_lookback,
+            volume_multiplier,
+            foreign_lookback,
+            foreign_min_sum,
+            use_foreign,
+        )
+        ma[lo:hi] = m
+        momentum[lo:hi] = mo
+        vol_avg[lo:hi] = va
+        foreign_sum[lo:hi] = fs
+        buy[lo:hi] = b
+        sell[lo:hi] = s
+    return ma, momentum, vol_avg, foreign_sum, buy, sell
+
+
+def _segment_starts(df: pd.DataFrame) -> np.ndarray:
+    """
+    df 행을 심볼 구간으로 나눈 시작 위치.
+    - 일반 (date index) 프레임: [0]
+    - (symbol, date) MultiIndex 유니버스 프레임: 심볼이 바뀌는 행마다 하나
+      (load_universe_ohlcv 결과처럼 심볼별 행이 연속이어야 함)
+    """
+    if not isinstance(df.index, pd.MultiIndex) or "symbol" not in df.index.names:
+        return np.zeros(1, dtype=np.int64)
+
+    codes = np.asarray(df.index.codes[df.index.names.index("symbol")])
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]).astype(np.int64)
+    if len(starts) != len(np.unique(codes)):
+        raise ValueError("universe frame: 심볼별 행이 연속되어 있지 않습니다. (symbol 기준 정렬 필요)")
+    return starts
+
+
+def _col(df: pd.DataFrame, name: str) -> np.ndarray:
+    return np.ascontiguousarray(df[name].to_numpy(dtype=np.float64))
+
+
+# pandas 2.x의 concat은 기본적으로 입력 블록을 전부 복사한다 -> copy=False로 공유.
+# (pandas 3은 Copy-on-Write가 기본이라 복사하지 않고, copy 인자는 deprecated)
+_CONCAT_NO_COPY: dict[str, Any] = {} if int(pd.__version__.split(".")[0]) >= 3 else {"copy": False}
+
+
+def _attach(df: pd.DataFrame, cols: dict[str, Any]) -> pd.DataFrame:
+    """
+    새 컬럼들을 concat 한 번으로 붙인 새 DataFrame 반환. (원본 df는 건드리지 않음)
+    같은 이름의 컬럼이 이미 있으면 새 값으로 대체한다.
+
+    원본 컬럼은 복사하지 않고 데이터를 공유하므로,
+    반환 프레임이나 입력 df의 기존 컬럼을 제자리 수정하지 말 것. (runner는 마지막 행만 읽음)
+    """
+    new = pd.DataFrame(cols, index=df.index)
+    overlap = df.columns.intersection(new.columns)
+    if len(overlap):
+        df = df.drop(columns=overlap)
+    return pd.concat([df, new], axis=1, **_CONCAT_NO_COPY)
+
+
 @dataclass
 class HSMSConfig:
     """
@@ -46,6 +223,7 @@ class HSMSStrategy(BaseStrategy):
         입력:
           - df: 최소한 ['close', 'volume'] 컬럼이 있는 일봉 데이터
                 (이미 loader에서 컬럼명 통일했다고 가정)
+                load_universe_ohlcv의 (symbol, date) 프레임이면 심볼별로 나눠 한 번에 계산
 
         출력:
           - df_with_signals: 원본 df에
@@ -56,38 +234,32 @@ class HSMSStrategy(BaseStrategy):
         if df.empty:
             return df.copy()
 
-        # 원본 손상 방지
-        df = df.copy()
-
         c = self.config
 
-        # 1) 추세: MA(20)
-        df["ma"] = df["close"].rolling(c.ma_window).mean()
-
-        # 2) 모멘텀: 5일 전 대비 가격 차이
-        df["momentum"] = df["close"] - df["close"].shift(c.momentum_window)
-
-        # 3) 거래량 기준: 최근 20일 평균
-        df["vol_avg"] = df["volume"].rolling(c.volume_lookback).mean()
-
-        # 4) 매수 신호 조건
-        buy_cond = (
-            (df["close"] > df["ma"])  # 추세 상방
-            & (df["momentum"] > 0)    # 모멘텀 플러스
-            & (df["volume"] > df["vol_avg"] * c.volume_multiplier)  # 거래량 증가
+        # MA(20) 추세 / 5일 모멘텀 / 20일 평균 거래량 -> 매수·매도 신호 (numba 커널)
+        close = _col(df, "close")
+        ma, momentum, vol_avg, _, buy, sell = _hsms_core_grouped(
+            close,
+            _col(df, "volume"),
+            close,  # 외국인 수급 미사용
+            _segment_starts(df),
+            c.ma_window,
+            c.momentum_window,
+            c.volume_lookback,
+            c.volume_multiplier,
+            1,
+            0.0,
+            False,
         )
 
-        # 5) 매도 신호 조건
-        sell_cond = (
-            (df["close"] < df["ma"] * 0.99)  # 추세 이탈(1% 이상)
-            | (df["momentum"] < 0)           # 모멘텀 마이너스
-        )
-
-        # NaN → False 처리
-        df["buy_signal"] = buy_cond.fillna(False)
-        df["sell_signal"] = sell_cond.fillna(False)
-
-        return df
+        # 컬럼을 하나씩 대입하지 않고 한 번에 붙인다. (원본은 그대로)
+        return _attach(df, {
+            "ma": ma,
+            "momentum": momentum,
+            "vol_avg": vol_avg,
+            "buy_signal": buy,
+            "sell_signal": sell,
+        })
 
 # ==============================
 # HSMS 2.0 (외국인 수급 필터 추가)
@@ -120,40 +292,37 @@ class HSMS2Strategy(BaseStrategy):
         if df.empty:
             return df.copy()
 
-        df = df.copy()
         c = self.config
 
-        # 1) 기본 HSMS 1.0 지표
-        df["ma"] = df["close"].rolling(c.ma_window).mean()
-        df["momentum"] = df["close"] - df["close"].shift(c.momentum_window)
-        df["vol_avg"] = df["volume"].rolling(c.volume_lookback).mean()
-
-        # 2) 외국인 순매수 롤링 합
-        if "foreign_net_buy" not in df.columns:
-            df["foreign_net_buy"] = 0.0
-
-        df["foreign_sum"] = (
-            df["foreign_net_buy"]
-            .rolling(c.foreign_lookback)
-            .sum()
+        extra: dict[str, Any] = {}
+        if "foreign_net_buy" in df.columns:
+            foreign = _col(df, "foreign_net_buy")
+        else:
+            foreign = np.zeros(len(df))
+            extra["foreign_net_buy"] = 0.0
+
+        # HSMS 1.0 지표 + 외국인 순매수 롤링 합 -> 매수·매도 신호 (numba 커널)
+        ma, momentum, vol_avg, foreign_sum, buy, sell = _hsms_core_grouped(
+            _col(df, "close"),
+            _col(df, "volume"),
+            foreign,
+            _segment_starts(df),
+            c.ma_window,
+            c.momentum_window,
+            c.volume_lookback,
+            c.volume_multiplier,
+            c.foreign_lookback,
+            c.foreign_min_sum,
+            True,
         )
 
-        # 3) 매수 조건
-        buy_cond = (
-            (df["close"] > df["ma"]) &
-            (df["momentum"] > 0) &
-            (df["volume"] > df["vol_avg"] * c.volume_multiplier) &
-            (df["foreign_sum"] > c.foreign_min_sum)
-        )
-
-        # 4) 매도 조건
-        sell_cond = (
-            (df["close"] < df["ma"] * 0.99) |
-            (df["momentum"] < 0) |
-            (df["foreign_sum"] < 0)
-        )
-
-        df["buy_signal"] = buy_cond.fillna(False)
-        df["sell_signal"] = sell_cond.fillna(False)
-
-        return df
+        # 컬럼을 하나씩 대입하지 않고 한 번에 붙인다. (원본은 그대로)
+        return _attach(df, {
+            **extra,
+            "ma": ma,
+            "momentum": momentum,
+            "vol_avg": vol_avg,
+            "foreign_sum": foreign_sum,
+            "buy_signal": buy,
+            "sell_signal": sell,
+        })
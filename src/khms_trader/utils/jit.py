@@ -0,0 +1,18 @@
+# src/khms_trader/utils/jit.py
+"""
+numba njit 래퍼.
+
+numba가 설치되어 있으면 그대로 사용하고,
+없으면 데코레이터를 무시해 순수 파이썬 루프로 동작한다. (결과 동일, 속도만 느림)
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    def njit(*args, **kwargs):  # type: ignore
+        if args and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+__all__ = ["njit"]
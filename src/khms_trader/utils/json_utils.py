@@ -0,0 +1,30 @@
+# src/khms_trader/utils/json_utils.py
+"""
+JSON 직렬화 헬퍼.
+
+orjson(C 확장)이 설치되어 있으면 사용하고,
+없으면 표준 json 모듈로 동일하게 동작한다.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def json_dumps_bytes(obj: Any) -> bytes:
+    """obj -> UTF-8 JSON bytes (한글 그대로 유지)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def json_loads(data: Union[bytes, str]) -> Any:
+    """JSON bytes/str -> 파이썬 객체"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,111 @@
+# src/khms_trader/utils/logging_utils.py
+"""
+khms_trader 로거.
+
+- stdout: get_logger()만으로 동작. 메시지만 그대로, 호출 스레드에서 바로 출력
+  (기존 print와 같은 모양/순서 -> loader/screener 등의 print와 섞여도 순서 유지)
+- 파일: 스크립트가 setup_logging()을 부를 때만 logs/khms_trader.log (크기 제한 + 로테이션).
+  파일 쓰기는 QueueListener 스레드 하나가 담당 (매매 루프가 디스크 I/O를 기다리지 않도록)
+
+모듈 import / get_logger()만으로는 스레드도 파일도 만들지 않는다.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
+
+# 예: /.../khms_trader/src/khms_trader/utils/logging_utils.py -> /.../khms_trader
+ROOT_DIR = Path(__file__).resolve().parents[3]
+LOG_DIR = ROOT_DIR / "logs"
+LOG_FILE = LOG_DIR / "khms_trader.log"
+
+# 모든 khms.* 로거는 이 부모 로거로 전파된다
+_ROOT_NAME = "khms"
+
+_lock = threading.Lock()
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """항상 현재 sys.stdout에 쓰는 핸들러 (print와 같은 스트림, redirect_stdout도 따라감)"""
+
+    @property
+    def stream(self):  # type: ignore[override]
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
+
+
+def _root_logger() -> logging.Logger:
+    root = logging.getLogger(_ROOT_NAME)
+    with _lock:
+        if not any(isinstance(h, _StdoutHandler) for h in root.handlers):
+            handler = _StdoutHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            root.addHandler(handler)
+            root.setLevel(logging.INFO)
+            # 루트 로거로 전파하지 않음 (중복 출력 방지)
+            root.propagate = False
+    return root
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    khms.* 이름의 로거. (부모 'khms' 로거의 stdout 핸들러를 공유)
+    같은 이름으로 여러 번 불러도 핸들러는 한 번만 붙는다.
+    """
+    _root_logger()
+    if name != _ROOT_NAME and not name.startswith(_ROOT_NAME + "."):
+        name = f"{_ROOT_NAME}.{name}"
+    return logging.getLogger(name)
+
+
+def _shutdown() -> None:
+    """종료 시 큐에 남은 로그를 모두 파일로 flush."""
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for h in listener.handlers:
+            h.close()
+
+
+def setup_logging(
+    log_file: Path = LOG_FILE,
+    *,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+) -> None:
+    """
+    파일 로그 켜기 (스크립트 진입점에서 한 번). 여러 번 불러도 한 번만 설정된다.
+    log_file이 max_bytes를 넘으면 .1 ~ .{backup_count}로 돌려 쓴다.
+    """
+    global _listener
+    root = _root_logger()
+    with _lock:
+        if _listener is not None:
+            return
+        try:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            fh = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+        except OSError as e:
+            print(f"[logging] file log disabled: {e}")
+            return
+        fh.setFormatter(logging.Formatter("%(asctime)s [%(name)s] %(message)s"))
+
+        q: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        _listener = logging.handlers.QueueListener(q, fh, respect_handler_level=True)
+        _listener.start()
+        root.addHandler(logging.handlers.QueueHandler(q))
+        atexit.register(_shutdown)
@@ -1,19 +1,46 @@
 # src/khms_trader/utils/time_utils.py
-from datetime import datetime
-import holidays
+import calendar
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def _kr_holiday_set(year: int) -> frozenset[date]:
+    """
+    해당 연도 한국 공휴일 집합. 연도별로 한 번만 계산.
+    holidays.KR()의 연도별 지연 생성(공유 객체 변경)을 조회 경로에서 없앤다.
+    holidays 패키지는 처음 필요할 때 import (모듈 import 시 비용 없음)
+    """
+    import holidays
+
+    return frozenset(holidays.KR(years=year).keys())
+
+
+@lru_cache(maxsize=32)
+def _trading_day_set(year: int, month: int) -> frozenset[date]:
+    """해당 월의 거래일(주말/공휴일 제외) 집합. 월 단위로 한 번만 계산"""
+    _, last = calendar.monthrange(year, month)
+    hols = _kr_holiday_set(year)
+    days = (date(year, month, d) for d in range(1, last + 1))
+    return frozenset(d for d in days if d.weekday() < 5 and d not in hols)
 
-kr_holidays = holidays.KR()
 
 def is_trading_day(dt: datetime | None = None) -> bool:
     if dt is None:
         dt = datetime.now()
 
-    # 주말
-    if dt.weekday() >= 5:
-        return False
+    # 주말 / 공휴일
+    d = dt.date() if isinstance(dt, datetime) else dt
+    return d in _trading_day_set(d.year, d.month)
+
 
-    # 공휴일
-    if dt.date() in kr_holidays:
-        return False
+def next_trading_day(dt: datetime | None = None) -> date:
+    """dt 다음 날부터 가장 가까운 거래일"""
+    if dt is None:
+        dt = datetime.now()
 
-    return True
+    d = dt.date() if isinstance(dt, datetime) else dt
+    while True:
+        d += timedelta(days=1)
+        if d in _trading_day_set(d.year, d.month):
+            return d
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from khms_trader.data.features import add_hsms_features, calc_atr, calc_ema, calc_rsi
+
+
+def _ohlcv(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    """랜덤 워크 일봉 (date index, loader 표준 컬럼)"""
+    rng = np.random.default_rng(seed)
+    close = 10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    spread = close * rng.uniform(0.0, 0.03, n)
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 1, n) * spread,
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(10_000, 1_000_000, n).astype(np.float64),
+            "foreign_net_buy": rng.normal(0, 50_000, n),
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq="B", name="date"),
+    )
+
+
+def _wilder_ref(x: pd.Series, period: int, first: int) -> pd.Series:
+    """
+    pandas Wilder 평활: x[first : first+period] 단순평균을 시작값으로
+    ewm(alpha=1/period, adjust=False) 재귀. 시작값 이전은 NaN.
+    """
+    seed = x.iloc[first:first + period].mean()
+    tail = x.iloc[first + period:]
+    seeded = pd.concat([pd.Series([seed], index=[x.index[first + period - 1]]), tail])
+    smoothed = seeded.ewm(alpha=1.0 / period, adjust=False).mean()
+    return smoothed.reindex(x.index)
+
+
+def _rsi_ref(close: pd.Series, period: int) -> pd.Series:
+    delta = close.diff()
+    avg_gain = _wilder_ref(delta.clip(lower=0), period, first=1)
+    avg_loss = _wilder_ref(-delta.clip(upper=0), period, first=1)
+    rs = avg_gain / (avg_loss + 1e-9)
+    return 100.0 - (100.0 / (1.0 + rs))
+
+
+def _atr_ref(df: pd.DataFrame, period: int) -> pd.Series:
+    prev_close = df["close"].shift(1)
+    tr = pd.concat(
+        [df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()],
+        axis=1,
+    ).max(axis=1)
+    return _wilder_ref(tr, period, first=0)
+
+
+@pytest.mark.parametrize("span", [5, 20, 50])
+def test_calc_ema_matches_pandas_ewm(span):
+    close = _ohlcv()["close"]
+    expected = close.ewm(span=span, adjust=False).mean()
+    pd.testing.assert_series_equal(calc_ema(close, span), expected, check_names=False, rtol=1e-10)
+
+
+@pytest.mark.parametrize("period", [2, 14, 30])
+def test_calc_rsi_matches_wilder_ewm(period):
+    close = _ohlcv()["close"]
+    got = calc_rsi(close, period)
+    assert got.iloc[:period].isna().all()
+    pd.testing.assert_series_equal(got, _rsi_ref(close, period), check_names=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("period", [1, 14, 30])
+def test_calc_atr_matches_wilder_ewm(period):
+    df = _ohlcv()
+    got = calc_atr(df, period)
+    assert got.iloc[:period - 1].isna().all()
+    pd.testing.assert_series_equal(got, _atr_ref(df, period), check_names=False, rtol=1e-9)
+
+
+def test_calc_rsi_short_series_is_all_nan():
+    close = _ohlcv(n=10)["close"]
+    assert calc_rsi(close, 14).isna().all()
+
+
+def test_add_hsms_features_matches_reference():
+    df = _ohlcv()
+    df.iloc[30, df.columns.get_loc("volume")] = np.nan  # 윈도우 안 NaN -> 이동평균 NaN
+    out = add_hsms_features(df)
+
+    # 원본 컬럼은 그대로, 지표는 float64
+    pd.testing.assert_frame_equal(out[df.columns], df)
+    for col in ["ema20", "ema50", "rsi", "atr", "vol_ma20", "foreign_buy_rolling"]:
+        assert out[col].dtype == np.float64, col
+
+    ema20 = df["close"].ewm(span=20, adjust=False).mean()
+    ema50 = df["close"].ewm(span=50, adjust=False).mean()
+    rsi = _rsi_ref(df["close"], 14)
+    vol_ma20 = df["volume"].rolling(20).mean()
+    foreign_buy_rolling = (df["foreign_net_buy"] > 0).astype(float).rolling(3).sum()
+
+    expected = pd.DataFrame(
+        {
+            "ema20": ema20,
+            "ema50": ema50,
+            "rsi": rsi,
+            "atr": _atr_ref(df, 14),
+            "vol_ma20": vol_ma20,
+            "trend_ok": (ema20 > ema50) & (df["close"] > ema20),
+            "rsi_cross_50": (rsi.shift(1) < 50) & (rsi >= 50),
+            "vol_ok": df["volume"] >= vol_ma20 * 1.3,
+            "foreign_buy_rolling": foreign_buy_rolling,
+            "foreign_trend_ok": foreign_buy_rolling >= 2,
+        }
+    )
+    pd.testing.assert_frame_equal(out[expected.columns], expected, rtol=1e-9)
+
+
+def test_add_hsms_features_missing_columns():
+    with pytest.raises(KeyError):
+        add_hsms_features(_ohlcv().drop(columns=["foreign_net_buy"]))
@@ -0,0 +1,92 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from khms_trader.data import loader
+
+
+def _write_csv(path, closes) -> None:
+    n = len(closes)
+    pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-02", periods=n, freq="B").strftime("%Y-%m-%d"),
+            "open": closes,
+            "high": closes,
+            "low": closes,
+            "close": closes,
+            "volume": [1000.0] * n,
+            "foreign_net_buy": [0.0] * n,
+        }
+    ).to_csv(path, index=False)
+
+
+def _touch(path, mtime_ns: int) -> None:
+    # 같은 초 안에 다시 써도 mtime이 확실히 달라지도록 직접 지정
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """data/raw, data/processed, data/cache를 tmp_path 아래로 돌리고 로드 캐시를 비운다."""
+    monkeypatch.setattr(loader, "RAW_DIR", tmp_path / "raw")
+    monkeypatch.setattr(loader, "PROCESSED_DIR", tmp_path / "processed")
+    monkeypatch.setattr(loader, "CACHE_DIR", tmp_path / "cache")
+    (tmp_path / "raw").mkdir()
+    loader._read_ohlcv_cached.cache_clear()
+    yield tmp_path
+    loader._read_ohlcv_cached.cache_clear()
+
+
+def test_cache_hit_for_unchanged_file(data_dir):
+    path = data_dir / "raw" / "000001.csv"
+    _write_csv(path, [100.0, 101.0, 102.0])
+
+    a = loader.load_symbol_ohlcv_with_foreign("000001")
+    b = loader.load_symbol_ohlcv_with_foreign("000001")
+
+    info = loader._read_ohlcv_cached.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+    # 얕은 복사본끼리 같은 캐시 배열을 공유
+    assert a is not b
+    assert np.shares_memory(a["close"].to_numpy(), b["close"].to_numpy())
+
+
+def test_cache_invalidated_when_file_modified(data_dir):
+    path = data_dir / "raw" / "000001.csv"
+    _write_csv(path, [100.0, 101.0, 102.0])
+    _touch(path, 1_700_000_000_000_000_000)
+    before = loader.load_symbol_ohlcv_with_foreign("000001")
+
+    _write_csv(path, [100.0, 101.0, 102.0, 103.0])
+    _touch(path, 1_700_000_000_000_000_001)
+    after = loader.load_symbol_ohlcv_with_foreign("000001")
+
+    assert before["close"].tolist() == [100.0, 101.0, 102.0]
+    assert after["close"].tolist() == [100.0, 101.0, 102.0, 103.0]
+    assert loader._read_ohlcv_cached.cache_info().misses == 2
+
+
+def test_cached_frame_is_read_only(data_dir):
+    _write_csv(data_dir / "raw" / "000001.csv", [100.0, 101.0, 102.0])
+    df = loader.load_symbol_ohlcv_with_foreign("000001")
+
+    with pytest.raises(ValueError):
+        df.iloc[0, df.columns.get_loc("close")] = 0.0
+    with pytest.raises(ValueError):
+        df["close"].to_numpy()[0] = 0.0
+
+    # 제자리 수정 시도가 캐시를 오염시키지 않음
+    assert loader.load_symbol_ohlcv_with_foreign("000001")["close"].iloc[0] == 100.0
+
+    # 컬럼 추가/교체, 복사본 수정은 허용
+    df["close"] = df["close"] * 2
+    df["ret"] = df["close"].pct_change()
+    copied = loader.load_symbol_ohlcv_with_foreign("000001").copy()
+    copied.iloc[0, copied.columns.get_loc("close")] = 0.0
+    assert loader.load_symbol_ohlcv_with_foreign("000001")["close"].iloc[0] == 100.0
+
+
+def test_missing_symbol_returns_empty(data_dir):
+    assert loader.load_symbol_ohlcv_with_foreign("999999").empty
@@ -0,0 +1,120 @@
+import os
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+
+from khms_trader.execution import scheduler
+from khms_trader.execution.scheduler import SingleInstanceLock, _next_run_dt, _parse_hhmm, _zi
+
+
+# -----------------------------
+# SingleInstanceLock
+# -----------------------------
+def test_second_acquirer_fails(tmp_path):
+    path = tmp_path / "run.lock"
+    with SingleInstanceLock(path):
+        assert path.read_text() == str(os.getpid())
+        with pytest.raises(RuntimeError, match="Lock exists"):
+            SingleInstanceLock(path).acquire()
+        # 실패한 쪽이 보유자의 lock 파일을 지우지 않는다
+        assert path.exists()
+
+    # 해제 후에는 파일이 지워지고 다음 실행이 잡을 수 있다
+    assert not path.exists()
+    with SingleInstanceLock(path):
+        assert path.exists()
+
+
+@pytest.mark.skipif(scheduler.fcntl is None, reason="flock 없는 환경은 stale lock을 회수하지 않음")
+def test_stale_lock_is_reclaimed(tmp_path):
+    path = tmp_path / "run.lock"
+    # 비정상 종료한 이전 실행의 잔재 (flock 없이 파일만 남음)
+    path.write_text("999999")
+
+    lock = SingleInstanceLock(path)
+    lock.acquire()
+    try:
+        assert path.read_text() == str(os.getpid())
+        with pytest.raises(RuntimeError):
+            SingleInstanceLock(path).acquire()
+    finally:
+        lock.release()
+    assert not path.exists()
+
+
+def test_release_is_idempotent(tmp_path):
+    lock = SingleInstanceLock(tmp_path / "run.lock")
+    lock.acquire()
+    lock.release()
+    lock.release()
+    assert not (tmp_path / "run.lock").exists()
+
+
+# -----------------------------
+# _next_run_dt (이진 탐색) vs 기존 선형 탐색
+# -----------------------------
+def _next_run_linear(times, now: datetime) -> datetime:
+    """기존 구현: 모든 시각의 후보를 만들어 가장 이른 것"""
+    candidates = []
+    for hh, mm in times:
+        dt = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        if dt <= now:
+            dt += timedelta(days=1)
+        candidates.append(dt)
+    return min(candidates)
+
+
+def _frozen_now(now: datetime):
+    class _Frozen(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now if tz is None else now.replace(tzinfo=tz)
+
+    return mock.patch.object(scheduler, "datetime", _Frozen)
+
+
+TIMES = sorted({_parse_hhmm(t) for t in ["09:01", "15:20", "08:30", "12:00", "09:01"]})
+
+
+@pytest.mark.parametrize(
+    "now, expected",
+    [
+        # 첫 시각 이전 / 사이 / 정각(지난 것으로 처리) / 정각 1us 전
+        ("2025-03-05 00:00:00", "2025-03-05 08:30"),
+        ("2025-03-05 08:45:10", "2025-03-05 09:01"),
+        ("2025-03-05 09:01:00", "2025-03-05 12:00"),
+        ("2025-03-05 09:00:59.999999", "2025-03-05 09:01"),
+        ("2025-03-05 12:00:00.000001", "2025-03-05 15:20"),
+        # 마지막 시각 이후 -> 다음 날 첫 시각
+        ("2025-03-05 15:20:00", "2025-03-06 08:30"),
+        ("2025-03-05 23:59:59.999999", "2025-03-06 08:30"),
+        # 주말/공휴일도 날짜만 넘긴다 (거래일 판정은 job 쪽 책임)
+        ("2025-03-07 16:00:00", "2025-03-08 08:30"),  # 금 -> 토
+        ("2025-03-09 15:30:00", "2025-03-10 08:30"),  # 일 -> 월
+        ("2025-02-28 15:30:00", "2025-03-01 08:30"),  # 월말 -> 삼일절
+        ("2025-12-31 23:00:00", "2026-01-01 08:30"),  # 연말 -> 신정
+    ],
+)
+def test_next_run_dt_table(now, expected):
+    tz = _zi("Asia/Seoul")
+    now_dt = datetime.fromisoformat(now).replace(tzinfo=tz)
+    with _frozen_now(now_dt):
+        got = _next_run_dt(TIMES, "Asia/Seoul")
+    assert got == datetime.fromisoformat(expected).replace(tzinfo=tz)
+    assert got == _next_run_linear(TIMES, now_dt)
+
+
+@pytest.mark.parametrize("tz_name", ["Asia/Seoul", "America/New_York"])
+@pytest.mark.parametrize("times", [[(9, 1)], [(0, 0), (23, 59)], TIMES])
+def test_next_run_dt_matches_linear_scan(tz_name, times):
+    tz = _zi(tz_name)
+    # 분 단위 + 경계 직전/직후 초, 서머타임 전환일 포함
+    days = [datetime(2025, 3, 7), datetime(2025, 3, 9), datetime(2025, 11, 2)]
+    for day in days:
+        for minute in range(0, 24 * 60, 7):
+            for sec, us in [(0, 0), (59, 999_999), (30, 1)]:
+                now = (day + timedelta(minutes=minute)).replace(second=sec, microsecond=us, tzinfo=tz)
+                with _frozen_now(now):
+                    got = _next_run_dt(times, tz_name)
+                assert got == _next_run_linear(times, now), now
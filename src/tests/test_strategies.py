@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from khms_trader.strategies.hsms import HSMS2Config, HSMS2Strategy, HSMSConfig, HSMSStrategy
+
+
+def _daily(n: int = 150, seed: int = 0) -> pd.DataFrame:
+    """랜덤 워크 일봉 (date index, close/volume/foreign_net_buy)"""
+    rng = np.random.default_rng(seed)
+    close = 10_000 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    volume = rng.integers(10_000, 1_000_000, n).astype(np.float64)
+    volume[n // 3] = np.nan  # 윈도우 안 NaN -> 평균 NaN, 신호 False
+    return pd.DataFrame(
+        {
+            "close": close,
+            "volume": volume,
+            "foreign_net_buy": rng.normal(0, 50_000, n),
+        },
+        index=pd.date_range("2024-01-01", periods=n, freq="B", name="date"),
+    )
+
+
+def _hsms_ref(df: pd.DataFrame, c: HSMSConfig) -> pd.DataFrame:
+    """기존 pandas 구현 (rolling / shift, NaN 비교는 False)"""
+    ma = df["close"].rolling(c.ma_window).mean()
+    momentum = df["close"] - df["close"].shift(c.momentum_window)
+    vol_avg = df["volume"].rolling(c.volume_lookback).mean()
+    buy = (df["close"] > ma) & (momentum > 0) & (df["volume"] > vol_avg * c.volume_multiplier)
+    sell = (df["close"] < ma * 0.99) | (momentum < 0)
+    return pd.DataFrame(
+        {"ma": ma, "momentum": momentum, "vol_avg": vol_avg, "buy_signal": buy, "sell_signal": sell}
+    )
+
+
+def _hsms2_ref(df: pd.DataFrame, c: HSMS2Config) -> pd.DataFrame:
+    ref = _hsms_ref(df, c)
+    foreign_sum = df["foreign_net_buy"].rolling(c.foreign_lookback).sum()
+    ref["foreign_sum"] = foreign_sum
+    ref["buy_signal"] &= foreign_sum > c.foreign_min_sum
+    ref["sell_signal"] |= foreign_sum < 0
+    return ref
+
+
+@pytest.mark.parametrize(
+    "config", [HSMSConfig(), HSMSConfig(ma_window=5, momentum_window=3, volume_lookback=10)]
+)
+def test_hsms_signals_match_pandas(config):
+    df = _daily()
+    out = HSMSStrategy(config).generate_signals(df)
+    ref = _hsms_ref(df, config)
+
+    pd.testing.assert_frame_equal(out[df.columns], df)
+    pd.testing.assert_frame_equal(out[ref.columns], ref, rtol=1e-9)
+    assert out["buy_signal"].any() and out["sell_signal"].any()
+
+
+@pytest.mark.parametrize(
+    "config", [HSMS2Config(), HSMS2Config(foreign_lookback=3, foreign_min_sum=10_000.0)]
+)
+def test_hsms2_signals_match_pandas(config):
+    df = _daily()
+    out = HSMS2Strategy(config).generate_signals(df)
+    ref = _hsms2_ref(df, config)
+
+    pd.testing.assert_frame_equal(out[df.columns], df)
+    pd.testing.assert_frame_equal(out[ref.columns], ref, rtol=1e-9)
+    assert out["buy_signal"].any() and out["sell_signal"].any()
+
+
+def test_hsms2_without_foreign_column():
+    df = _daily().drop(columns=["foreign_net_buy"])
+    out = HSMS2Strategy().generate_signals(df)
+
+    # 외국인 수급이 없으면 0으로 채우고, 합이 0이라 매수 신호는 나오지 않는다
+    assert (out["foreign_net_buy"] == 0.0).all()
+    assert not out["buy_signal"].any()
+    pd.testing.assert_series_equal(
+        out["sell_signal"], _hsms_ref(df, HSMS2Config())["sell_signal"]
+    )
+
+
+def test_empty_frame():
+    df = _daily().iloc[:0]
+    assert HSMSStrategy().generate_signals(df).empty
+    assert HSMS2Strategy().generate_signals(df).empty
+
+
+# ------------------------------
+# 유니버스 (symbol, date) 배치 경로 / 마지막 봉 신호 캐시
+# ------------------------------
+
+def _universe(lengths=(150, 90, 30, 3)) -> dict[str, pd.DataFrame]:
+    return {f"{i:06d}": _daily(n, seed=i) for i, n in enumerate(lengths)}
+
+
+def _long(frames: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    return pd.concat(frames, names=["symbol", "date"])
+
+
+@pytest.mark.parametrize("strategy", [HSMSStrategy(), HSMS2Strategy()])
+def test_grouped_universe_matches_per_symbol(strategy):
+    frames = _universe()
+    out = strategy.generate_signals(_long(frames))
+
+    # 롤링 윈도우가 심볼 경계를 넘지 않아야 한다
+    for sym, df in frames.items():
+        pd.testing.assert_frame_equal(
+            out.xs(sym, level="symbol"), strategy.generate_signals(df), check_freq=False
+        )
+
+
+def test_grouped_universe_requires_contiguous_symbols():
+    long = _long(_universe())
+    shuffled = long.iloc[np.r_[0:10, 200:210, 10:20]]
+    with pytest.raises(ValueError):
+        HSMSStrategy().generate_signals(shuffled)
+
+
+class _CountingStrategy(HSMSStrategy):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def generate_signals(self, df: pd.DataFrame) -> pd.DataFrame:
+        self.calls += 1
+        return super().generate_signals(df)
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    from khms_trader.execution import runner as r
+
+    monkeypatch.setattr(r, "_signal_cache", type(r._signal_cache)())
+    return r
+
+
+def _next_bar(df: pd.DataFrame, close_mult: float = 1.05) -> pd.DataFrame:
+    last = df.iloc[[-1]].copy()
+    last.index = [df.index[-1] + pd.offsets.BDay(1)]
+    last.index.name = df.index.name
+    last["close"] *= close_mult
+    return pd.concat([df, last])
+
+
+def test_last_signal_row_cache_refreshes_on_new_bar(runner):
+    strategy = _CountingStrategy()
+    df = _daily()
+
+    first = runner._last_signal_row(strategy, "000000", df)
+    again = runner._last_signal_row(strategy, "000000", df)
+    assert strategy.calls == 1
+    assert again is first
+
+    # 새 봉이 붙으면 다시 계산 (캐시된 이전 봉 결과를 돌려주지 않음)
+    grown = _next_bar(df)
+    fresh = runner._last_signal_row(strategy, "000000", grown)
+    assert strategy.calls == 2
+    assert fresh.name == grown.index[-1]
+    pd.testing.assert_series_equal(fresh, HSMSStrategy().generate_signals(grown).iloc[-1])
+
+    # 같은 날짜의 마지막 봉 값이 바뀌어도 다시 계산
+    revised = grown.copy()
+    revised.iloc[-1, revised.columns.get_loc("close")] *= 0.9
+    runner._last_signal_row(strategy, "000000", revised)
+    assert strategy.calls == 3
+
+
+def test_prepare_universe_matches_per_symbol_and_uses_cache(runner, monkeypatch):
+    frames = _universe()
+    monkeypatch.setattr(
+        runner, "load_universe_ohlcv", lambda symbols: _long({s: frames[s] for s in symbols if s in frames})
+    )
+    symbols = [*frames, "999999"]  # 데이터 없는 심볼 포함
+
+    strategy = _CountingStrategy()
+    got = runner._prepare_universe(strategy, symbols)
+    assert strategy.calls == 1
+    assert [s for s, _, _ in got] == symbols
+    assert got[-1] == ("999999", None, None)
+    for sym, summary, err in got[:-1]:
+        expected = runner._row_summary(HSMSStrategy().generate_signals(frames[sym]).iloc[-1])
+        assert summary == expected and err is None
+
+    # 심볼별 경로와 같은 캐시 키 -> 배치로 채운 결과를 심볼별 경로가 그대로 재사용
+    sym0 = symbols[0]
+    runner._last_signal_row(strategy, sym0, frames[sym0])
+    assert strategy.calls == 1
+
+    # 한 심볼에만 새 봉 -> 그 심볼만 다시 계산하고 나머지는 캐시
+    frames[sym0] = _next_bar(frames[sym0])
+    seen = []
+    orig = strategy.generate_signals
+    monkeypatch.setattr(strategy, "generate_signals", lambda df: seen.append(df) or orig(df))
+    got2 = runner._prepare_universe(strategy, symbols)
+    assert strategy.calls == 2
+    assert list(seen[0].index.unique(level="symbol")) == [sym0]
+    assert got2[0][1] == runner._row_summary(HSMSStrategy().generate_signals(frames[sym0]).iloc[-1])
+    assert got2[0][1][0] == frames[sym0].index[-1]
+    assert got2[1:] == got[1:]